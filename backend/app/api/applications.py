@@ -0,0 +1,59 @@
+"""
+Admin listing of all student applications.
+
+Paged newest first with opaque keyset cursors (see app.core.pagination);
+filters on payment status and a createdAt range each have a matching
+compound index.
+"""
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.core.database import get_database
+from app.core.pagination import fetch_page, field_projection
+from app.core.responses import ORJSONResponse
+from app.api.deps import get_current_user
+from app.models.application import APPLICATION_FIELDS
+from app.models.user import UserInDB
+
+router = APIRouter()
+
+PAYMENT_STATUSES = ("pending", "paid", "failed")
+
+
+@router.get("", response_description="List applications")
+async def list_applications(
+    paymentStatus: Optional[str] = None,
+    createdFrom: Optional[datetime] = Query(None, description="Only applications created at or after this time"),
+    createdTo: Optional[datetime] = Query(None, description="Only applications created before this time"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    if paymentStatus is not None and paymentStatus not in PAYMENT_STATUSES:
+        raise HTTPException(status_code=400, detail=f"paymentStatus must be one of {', '.join(PAYMENT_STATUSES)}")
+
+    query = {}
+    if paymentStatus:
+        query["paymentStatus"] = paymentStatus
+    if createdFrom or createdTo:
+        query["createdAt"] = {}
+        if createdFrom:
+            query["createdAt"]["$gte"] = createdFrom
+        if createdTo:
+            query["createdAt"]["$lt"] = createdTo
+
+    db = get_database()
+    try:
+        docs, next_cursor = await fetch_page(
+            db.applications, query, limit, cursor, field_projection(fields, APPLICATION_FIELDS)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return ORJSONResponse({
+        "applications": docs,
+        "nextCursor": next_cursor,
+    })
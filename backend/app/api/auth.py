@@ -1,24 +1,39 @@
 from datetime import timedelta
 from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from app.core.security import create_access_token, verify_password
+from app.core.security import create_access_token, verify_and_update_password
 from app.core.database import get_database
+from app.core.rate_limit import RateLimit, check_rate_limit, client_ip, limit_by_ip
 from app.models.user import UserInDB, UserLogin
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, invalidate_user
 
 router = APIRouter()
 
-@router.post("/token")
-async def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
+LOGIN_PER_IP_LIMIT = RateLimit("login_ip", 20, 300)
+# Failed logins per (email, client IP): only failures use up tokens, so
+# nobody can lock an account out from elsewhere by guessing at it
+LOGIN_FAILURE_LIMIT = RateLimit("login_failures", 5, 300)
+
+@router.post("/token", dependencies=[Depends(limit_by_ip(LOGIN_PER_IP_LIMIT))])
+async def login(request: Request, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
+    failure_key = f"{form_data.username.lower()}:{client_ip(request)}"
+    await check_rate_limit(LOGIN_FAILURE_LIMIT, failure_key, cost=0)
     db = get_database()
     user = await db.users.find_one({"email": form_data.username})
-    if not user or not verify_password(form_data.password, user["hashed_password"]):
+    if user:
+        valid, new_hash = await verify_and_update_password(form_data.password, user["hashed_password"])
+    if not user or not valid:
+        await check_rate_limit(LOGIN_FAILURE_LIMIT, failure_key)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        # Stored hash predates the current BCRYPT_ROUNDS; upgrade it transparently
+        await db.users.update_one({"_id": user["_id"]}, {"$set": {"hashed_password": new_hash}})
+        invalidate_user(user["email"])
     access_token_expires = timedelta(minutes=30)
     access_token = create_access_token(
         data={"sub": user["email"]}, expires_delta=access_token_expires
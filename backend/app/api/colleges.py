@@ -1,68 +1,220 @@
-from typing import List, Optional
-from fastapi import APIRouter, Body, Request, HTTPException, status, Depends, UploadFile, File
-from app.models.college import CollegeCreate, CollegeUpdate, CollegeInDB
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, BackgroundTasks, Body, Request, Response, HTTPException, status, Depends, UploadFile, File, Query
+from fastapi.concurrency import run_in_threadpool
+from app.models.college import (
+    CollegeBatchRequest, CollegeCreate, CollegeUpdate, CollegeInDB, CollegeSearchFilters, VIEW_FIELDS,
+)
 from app.core.database import get_database
+from app.core.catalog import get_catalog, project
+from app.core.import_jobs import create_job, get_job, run_job
+from app.core.config import settings
+from app.core.http_cache import cache_headers, etag_matches, make_etag, not_modified
+from app.core.responses import ORJSONResponse, json_bytes_response
+from app.core.compression import PrecompressedBody, negotiate
+from app.core.normalize import compare_columns, derived_fields
 from app.api.deps import get_current_user
+from app.api.exports import export_response
 from app.models.user import UserInDB
 
 router = APIRouter()
 
+MAX_LIST_LIMIT = 1000
+MAX_BATCH_IDS = 100
+MAX_COMPARE_IDS = 10
+
+async def _encoded_response(request: Request, body: PrecompressedBody, etag: str) -> Response:
+    """Serve a pre-encoded catalog body in the client's preferred encoding."""
+    encoding = negotiate(request.headers.get("accept-encoding"))
+    if body.ready(encoding):
+        encoding, content = body.variant(encoding)
+    else:
+        # First request for this variant: compress off the event loop
+        encoding, content = await run_in_threadpool(body.variant, encoding)
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding:
+        # Each encoding is a different representation and needs its own tag
+        headers["Content-Encoding"] = encoding
+        etag = f'{etag[:-1]}-{encoding}"'
+    response = json_bytes_response(content, headers=headers)
+    return not_modified(request, response, etag, settings.CATALOG_CACHE_CONTROL) or response
+
+# Fields a `fields=` selection may name, in response order
+COLLEGE_FIELDS = tuple(name for name in CollegeInDB.model_fields if name != "mongo_id") + ("_id",)
+
+def field_selection(default_view: Optional[str] = None):
+    """Dependency resolving `view=` / `fields=` to the fields to return (None = all)."""
+    def dependency(
+        view: Optional[str] = Query(None, description=f"Named field set: {', '.join(VIEW_FIELDS)}"),
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    ) -> Optional[Tuple[str, ...]]:
+        if view and fields:
+            raise HTTPException(status_code=400, detail="Pass either view or fields, not both")
+        if fields:
+            requested = {f.strip() for f in fields.split(",") if f.strip()} | {"id"}
+            unknown = requested - set(COLLEGE_FIELDS)
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+            # Canonical order so equal selections share one cached encoding
+            return tuple(f for f in COLLEGE_FIELDS if f in requested)
+        view = view or default_view
+        if view is None:
+            return None
+        if view not in VIEW_FIELDS:
+            raise HTTPException(status_code=400, detail=f"Unknown view: {view}")
+        return VIEW_FIELDS[view]
+    return dependency
+
 @router.get("/", response_description="List all colleges", response_model=List[CollegeInDB])
-async def list_colleges(limit: int = 100, skip: int = 0):
-    db = get_database()
-    colleges = await db.colleges.find().skip(skip).limit(limit).to_list(limit)
-    return colleges
+async def list_colleges(
+    request: Request,
+    limit: int = Query(100, ge=1, le=MAX_LIST_LIMIT),
+    skip: int = Query(0, ge=0),
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection()),
+):
+    snapshot = await get_catalog().get()
+    etag = make_etag(snapshot.content_hash, str(skip), str(limit), ",".join(fields or ()))
+    # Body is encoded and compressed once per catalog version and field set;
+    # requests only copy bytes
+    return await _encoded_response(request, snapshot.encoded_page(skip, limit, fields), etag)
+
+def search_filters(
+    q: Optional[str] = None,
+    collegeType: List[str] = Query([]),
+    category: List[str] = Query([]),
+    state: List[str] = Query([]),
+    courses: List[str] = Query([]),
+    entranceExams: List[str] = Query([]),
+    accreditation: List[str] = Query([]),
+    minPlacement: float = 0,
+    maxFeesLakhs: Optional[float] = None,
+    minAvgPackageLpa: Optional[float] = None,
+    minMedianPackageLpa: Optional[float] = None,
+    hostel: bool = False,
+    nirfOnly: bool = False,
+) -> CollegeSearchFilters:
+    return CollegeSearchFilters(
+        q=q, collegeType=collegeType, category=category, state=state,
+        courses=courses, entranceExams=entranceExams, accreditation=accreditation,
+        minPlacement=minPlacement, maxFeesLakhs=maxFeesLakhs, minAvgPackageLpa=minAvgPackageLpa,
+        minMedianPackageLpa=minMedianPackageLpa, hostel=hostel, nirfOnly=nirfOnly,
+    )
+
+@router.get("/search", response_description="Search and filter colleges")
+async def search_colleges(
+    request: Request,
+    filters: CollegeSearchFilters = Depends(search_filters),
+    sort: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=200),
+    skip: int = Query(0, ge=0),
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection()),
+):
+    """
+    Filter the catalog server-side so clients only download one page.
+
+    `sort` is one of name, rating, placement, nirfRank, year, fees,
+    avgPackage, medianPackage; prefix with `-` for descending. Without it
+    results keep catalog order. Fees and package filters and sorts use the
+    numeric fields derived from the text (lakhs / LPA).
+    """
+    snapshot = await get_catalog().get()
+    index = snapshot.index
+    if sort is not None and sort not in index.orders:
+        raise HTTPException(status_code=400, detail=f"Unsupported sort key: {sort}")
+
+    etag = make_etag(snapshot.content_hash, str(request.query_params))
+    headers = cache_headers(etag, settings.CATALOG_CACHE_CONTROL)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    mask = index.match(filters)
+    positions = index.select(mask, sort, skip, limit)
+    return ORJSONResponse({
+        "total": mask.bit_count(),
+        "skip": skip,
+        "limit": limit,
+        "colleges": [project(snapshot.colleges[pos], fields) for pos in positions],
+    }, headers=headers)
+
+@router.get("/facets", response_description="Facet values with result counts")
+async def college_facets(
+    request: Request,
+    filters: CollegeSearchFilters = Depends(search_filters),
+):
+    """
+    Filter options with the number of results each would give under the
+    current filter set. Takes the same filters as /colleges/search.
+    """
+    snapshot = await get_catalog().get()
+    etag = make_etag(snapshot.content_hash, "facets", str(request.query_params))
+    headers = cache_headers(etag, settings.CATALOG_CACHE_CONTROL)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    index = snapshot.index
+    return ORJSONResponse({
+        "total": index.match(filters).bit_count(),
+        "facets": index.facet_counts(filters),
+    }, headers=headers)
+
+@router.post("/batch", response_description="Get many colleges at once")
+async def batch_colleges(
+    batch: CollegeBatchRequest,
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection()),
+):
+    """Colleges for a list of ids, in request order; unknown ids are listed in `missing`."""
+    if len(batch.ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids per batch")
+    snapshot = await get_catalog().get()
+    colleges, missing = snapshot.get_many(batch.ids)
+    return ORJSONResponse({
+        "colleges": [project(c, fields) for c in colleges],
+        "missing": missing,
+    })
+
+@router.get("/compare", response_description="Compare colleges side by side")
+async def compare_colleges(
+    request: Request,
+    ids: List[str] = Query(..., description="College ids, repeated or comma-separated"),
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection("compare")),
+):
+    """
+    The selected colleges (compare view by default) plus numeric columns
+    parsed from their fees, package, area, ratio and cutoff text, with the
+    best college per column.
+    """
+    ids = [i.strip() for value in ids for i in value.split(",") if i.strip()]
+    if not ids or len(ids) > MAX_COMPARE_IDS:
+        raise HTTPException(status_code=400, detail=f"Compare between 1 and {MAX_COMPARE_IDS} colleges")
+
+    snapshot = await get_catalog().get()
+    colleges, missing = snapshot.get_many(ids)
+    etag = make_etag(*(snapshot.hash_of(i) or f"missing:{i}" for i in ids), ",".join(fields or ()))
+    headers = cache_headers(etag, settings.CATALOG_CACHE_CONTROL)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    return ORJSONResponse({
+        "ids": [c["id"] for c in colleges],
+        "colleges": [project(c, fields) for c in colleges],
+        "columns": compare_columns(colleges),
+        "missing": missing,
+    }, headers=headers)
 
 @router.get("/export", response_description="Export colleges")
-async def export_colleges():
-    import pandas as pd
-    import io
-    from fastapi.responses import StreamingResponse
-    
-    db = get_database()
-    colleges = await db.colleges.find().to_list(10000)
-    
-    if not colleges:
-        return {"message": "No data to export"}
-
-    # Flatten coordinates if needed?
-    data_list = []
-    for c in colleges:
-        c_dict = dict(c)
-        if "_id" in c_dict: del c_dict["_id"]
-        if "mongo_id" in c_dict: del c_dict["mongo_id"]
-        
-        # Flatten coords
-        if "coordinates" in c_dict and c_dict["coordinates"]:
-            coords = c_dict.pop("coordinates")
-            if isinstance(coords, dict):
-                c_dict["lat"] = coords.get("lat")
-                c_dict["lng"] = coords.get("lng")
-        
-        # Join lists
-        list_fields = ["topRecruiters", "accreditation", "entranceExams", "courses"]
-        for field in list_fields:
-            if field in c_dict and isinstance(c_dict[field], list):
-                c_dict[field] = ", ".join(c_dict[field])
-                
-        data_list.append(c_dict)
-
-    df = pd.DataFrame(data_list)
-    stream = io.StringIO()
-    df.to_csv(stream, index=False)
-    
-    response = StreamingResponse(iter([stream.getvalue()]), media_type="text/csv")
-    response.headers["Content-Disposition"] = "attachment; filename=colleges.csv"
-    return response
+async def export_colleges(format: str = "csv"):
+    return await export_response("colleges", format)
 
 @router.get("/{id}", response_description="Get a single college", response_model=CollegeInDB)
-async def show_college(id: str):
-    db = get_database()
-    # Try custom ID first
-    college = await db.colleges.find_one({"id": id})
-    if college is None:
+async def show_college(
+    id: str,
+    request: Request,
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection()),
+):
+    snapshot = await get_catalog().get()
+    body = snapshot.encoded(id, fields)
+    if body is None:
         raise HTTPException(status_code=404, detail=f"College {id} not found")
-    return college
+    return await _encoded_response(request, body, make_etag(snapshot.hash_of(id), ",".join(fields or ())))
 
 @router.post("/", response_description="Add new college", response_model=CollegeInDB)
 async def create_college(college: CollegeCreate, current_user: UserInDB = Depends(get_current_user)):
@@ -74,9 +226,11 @@ async def create_college(college: CollegeCreate, current_user: UserInDB = Depend
     
     # Exclude mongo_id from input, let Mongo generate it
     college_data = college.model_dump(by_alias=True, exclude={"mongo_id"})
+    college_data.update(derived_fields(college_data))
     
     new_college = await db.colleges.insert_one(college_data)
     created_college = await db.colleges.find_one({"_id": new_college.inserted_id})
+    await get_catalog().upsert(created_college)
     return created_college
 
 @router.put("/{id}", response_description="Update a college", response_model=CollegeInDB)
@@ -92,13 +246,18 @@ async def update_college(id: str, college: CollegeUpdate, current_user: UserInDB
          if existing: return existing
          raise HTTPException(status_code=404, detail=f"College {id} not found")
 
+    # Recompute the numbers behind any text field being changed
+    update_data.update(derived_fields(update_data))
+
+    # A manual edit means the document no longer matches its last import row
     update_result = await db.colleges.update_one(
-        {"id": id}, {"$set": update_data}
+        {"id": id}, {"$set": update_data, "$unset": {"importHash": ""}}
     )
     
     if update_result.modified_count == 1:
         updated_college = await db.colleges.find_one({"id": id})
         if updated_college is not None:
+            await get_catalog().upsert(updated_college)
             return updated_college
     
     existing = await db.colleges.find_one({"id": id})
@@ -112,68 +271,36 @@ async def delete_college(id: str, current_user: UserInDB = Depends(get_current_u
     db = get_database()
     delete_result = await db.colleges.delete_one({"id": id})
     if delete_result.deleted_count == 1:
+        await get_catalog().remove(id)
         return {"message": "College deleted successfully"}
     raise HTTPException(status_code=404, detail=f"College {id} not found")
 
-@router.post("/import", response_description="Import colleges from CSV/Excel")
-async def import_colleges(file: UploadFile = File(...), current_user: UserInDB = Depends(get_current_user)):
-    import pandas as pd
-    import io
-    
-    contents = await file.read()
-    if file.filename.endswith('.csv'):
-        df = pd.read_csv(io.BytesIO(contents))
-    elif file.filename.endswith(('.xls', '.xlsx')):
-        df = pd.read_excel(io.BytesIO(contents))
-    else:
+@router.post("/import", response_description="Import colleges from CSV/Excel", status_code=status.HTTP_202_ACCEPTED)
+async def import_colleges(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    dry_run: bool = False,
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """
+    Queue an import job and return its id immediately.
+    Poll GET /colleges/import/{job_id} for progress.
+
+    Only rows that differ from the last import are written. With
+    `dry_run=true` the job just reports the added / changed / unchanged /
+    removed diff and writes nothing.
+    """
+    if not file.filename.endswith(('.csv', '.xls', '.xlsx')):
         raise HTTPException(status_code=400, detail="Invalid file format")
-    
-    db = get_database()
-    results = {"inserted": 0, "updated": 0, "errors": []}
-    
-    for _, row in df.iterrows():
-        try:
-            data = row.to_dict()
-            # Clean NaN
-            data = {k: v for k, v in data.items() if pd.notna(v)}
-            
-            if "id" not in data:
-                results["errors"].append(f"Row {_}: Missing ID")
-                continue
-            
-            # Handle list fields (assume comma separated strings in CSV)
-            list_fields = ["topRecruiters", "accreditation", "entranceExams", "courses"]
-            for field in list_fields:
-                if field in data and isinstance(data[field], str):
-                    data[field] = [x.strip() for x in data[field].split(",")]
-            
-            # Upsert
-            existing = await db.colleges.find_one({"id": data["id"]})
-            if existing:
-                await db.colleges.update_one({"id": data["id"]}, {"$set": data})
-                results["updated"] += 1
-            else:
-                # Validate with Create model (might fail if fields missing)
-                # Ideally validation happens here.
-                # We'll try to insert raw for flexibility or use model logic if strict
-                # Using model logic is safer.
-                try:
-                    # We might need to handle coordinates separately if flattened in CSV (lat, lng columns)
-                    if "coordinates" not in data and "lat" in data and "lng" in data:
-                        data["coordinates"] = {"lat": data.pop("lat"), "lng": data.pop("lng")}
-                    
-                    # Create model
-                    # college_in = CollegeCreate(**data)
-                    # For now just insert data, let's trust admin or basic validation
-                    
-                    await db.colleges.insert_one(data)
-                    results["inserted"] += 1
-                except Exception as e:
-                    results["errors"].append(f"ID {data['id']}: {str(e)}")
-
-        except Exception as e:
-            results["errors"].append(f"Row Error: {str(e)}")
-            
-    return results
 
+    contents = await file.read()
+    job_id = await create_job(file.filename, current_user.email, dry_run)
+    background_tasks.add_task(run_job, job_id, file.filename, contents, dry_run)
+    return {"jobId": job_id, "status": "queued"}
 
+@router.get("/import/{job_id}", response_description="Import job progress")
+async def import_status(job_id: str, current_user: UserInDB = Depends(get_current_user)):
+    job = await get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Import job {job_id} not found")
+    return job
@@ -1,30 +1,50 @@
+import time
 from typing import Annotated
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 import jwt
 from pydantic import ValidationError
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.models.user import UserInDB
 from app.core.database import get_database
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Admin requests come in runs (college grid, bulk edits); skip the JWT decode
+# and users lookup for tokens and users seen in the last few seconds.
+# Other workers see user changes once their entries expire.
+_token_cache = TTLCache(maxsize=settings.AUTH_CACHE_SIZE, ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS)  # token -> email
+_user_cache = TTLCache(maxsize=settings.AUTH_CACHE_SIZE, ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS)  # email -> UserInDB
+
+def invalidate_user(email: str) -> None:
+    """Drop a cached user after its document changes."""
+    _user_cache.pop(email)
+
 async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
+    email = _token_cache.get(token)
+    if email is None:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            email: str = payload.get("sub")
+            if email is None:
+                raise credentials_exception
+        except jwt.PyJWTError:
             raise credentials_exception
-    except jwt.PyJWTError:
-        raise credentials_exception
-    
-    db = get_database()
-    user = await db.users.find_one({"email": email})
+        # Never serve a token from cache past its own expiry
+        _token_cache.set(token, email, ttl_seconds=payload["exp"] - time.time() if "exp" in payload else None)
+
+    user = _user_cache.get(email)
     if user is None:
-        raise credentials_exception
-    return UserInDB(**user)
+        db = get_database()
+        user = await db.users.find_one({"email": email})
+        if user is None:
+            raise credentials_exception
+        user = UserInDB(**user)
+        _user_cache.set(email, user)
+    return user
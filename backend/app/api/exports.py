@@ -0,0 +1,44 @@
+"""
+Admin data exports — colleges, students and applications as CSV or XLSX.
+
+Responses stream while the Mongo cursor is being read, so exports of any
+size run in constant memory.
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.core.database import get_database
+from app.core.export import EXPORTS, export_columns, stream_csv, stream_xlsx
+from app.api.deps import get_current_user
+from app.models.user import UserInDB
+
+router = APIRouter()
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+async def export_response(name: str, format: str = "csv"):
+    """Build a streaming download of the `name` collection."""
+    if format not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Format must be csv or xlsx")
+
+    db = get_database()
+    spec = EXPORTS[name]
+    if await db[spec.collection].find_one({}, {"_id": 1}) is None:
+        return {"message": "No data to export"}
+
+    columns = await export_columns(db, spec)
+    stream = stream_csv(db, spec, columns) if format == "csv" else stream_xlsx(db, spec, columns)
+    response = StreamingResponse(stream, media_type=MEDIA_TYPES[format])
+    response.headers["Content-Disposition"] = f"attachment; filename={name}.{format}"
+    return response
+
+
+@router.get("/{name}", response_description="Export a collection")
+async def export_collection(name: str, format: str = "csv", current_user: UserInDB = Depends(get_current_user)):
+    if name not in EXPORTS:
+        raise HTTPException(status_code=404, detail=f"Unknown export {name}")
+    return await export_response(name, format)
@@ -4,26 +4,63 @@ OTP verification endpoints using 2Factor.in SMS API.
 Flow:
   1. POST /otp/send   → Sends OTP to phone via 2Factor, stores session in DB
   2. POST /otp/verify  → Verifies OTP against 2Factor session
+
+The provider is chosen by settings.OTP_PROVIDER (see app.core.otp_provider).
+Provider calls go through a circuit breaker: while 2Factor is failing or
+slow, requests get an immediate 503 instead of waiting on it.
+
+Sends and verifications are throttled per IP and per phone with token
+buckets (app.core.rate_limit) before anything reaches Mongo or 2Factor.
+
+Retention: every session carries an `expires_at` that a TTL index acts on.
+Unverified sessions live for SESSION_RETENTION_SECONDS, i.e. until the OTP
+expires (rate limits no longer count sessions); verified ones are compacted
+to the facts onboarding needs and kept for VERIFIED_RETENTION_SECONDS.
+Sessions stored before this policy are migrated once by
+scripts/compact_otp_sessions.py.
 """
+import asyncio
+import math
 import re
-from datetime import datetime, timezone
-from fastapi import APIRouter, HTTPException, status
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, field_validator
-import httpx
 
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError
 from app.core.config import settings
 from app.core.database import get_database
+from app.core.otp_provider import OTPProviderError, get_otp_provider
+from app.core.rate_limit import RateLimit, check_rate_limit, limit_by_ip
+from app.core.system_settings import get_system_settings
 
 router = APIRouter()
 
 # --- Constants ---
-TWOFACTOR_BASE_URL = "https://2factor.in/API/V1"
 OTP_EXPIRY_SECONDS = 300  # 5 minutes
 MAX_SEND_PER_PHONE = 3     # Max OTPs per phone in rate-limit window
 RATE_LIMIT_WINDOW = 900     # 15 minutes in seconds
 MAX_VERIFY_ATTEMPTS = 5     # Max wrong OTP attempts per session
 PHONE_REGEX = re.compile(r"^[6-9]\d{9}$")  # Valid Indian mobile number
 DEV_BYPASS_OTP = "1234"     # Always-accepted test OTP for development
+SESSION_RETENTION_SECONDS = OTP_EXPIRY_SECONDS
+VERIFIED_RETENTION_SECONDS = 24 * 60 * 60  # Time allowed between verifying and onboarding
+
+SEND_PER_PHONE_LIMIT = RateLimit("otp_send_phone", MAX_SEND_PER_PHONE, RATE_LIMIT_WINDOW)
+SEND_PER_IP_LIMIT = RateLimit("otp_send_ip", 10, RATE_LIMIT_WINDOW)
+VERIFY_PER_PHONE_LIMIT = RateLimit("otp_verify_phone", 10, RATE_LIMIT_WINDOW)
+VERIFY_PER_IP_LIMIT = RateLimit("otp_verify_ip", 30, RATE_LIMIT_WINDOW)
+
+provider_breaker = CircuitBreaker(
+    "otp_provider",
+    timeout_seconds=settings.OTP_PROVIDER_TIMEOUT_SECONDS,
+    window_seconds=60,          # Rolling window the ratios are computed over
+    min_calls=5,                # Don't judge the provider on fewer calls
+    failure_ratio=0.5,          # Open when half the calls fail or time out...
+    slow_call_seconds=2.0,
+    slow_ratio=0.8,             # ...or nearly all of them are slow
+    open_seconds=30,            # Fail fast this long before probing again
+    failure_exceptions=(OTPProviderError,),
+)
 
 
 # --- Request/Response Models ---
@@ -71,60 +108,73 @@ class OTPVerifyResponse(BaseModel):
     message: str
 
 
+# --- Provider calls ---
+async def _call_provider(method, *args):
+    """Call the OTP provider through the circuit breaker, mapping failures to HTTP errors."""
+    try:
+        return await provider_breaker.call(method, *args)
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="OTP service is temporarily unavailable. Please try again shortly.",
+            headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="OTP provider took too long to respond. Please try again."
+        )
+    except OTPProviderError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=str(e)
+        )
+
+
+# --- Session retention ---
+async def _mark_verified(db, session_id, now: datetime):
+    """Mark a session verified and drop everything onboarding doesn't need."""
+    await db.otp_sessions.update_one(
+        {"_id": session_id},
+        {
+            "$set": {
+                "verified": True,
+                "verified_at": now,
+                "expires_at": now + timedelta(seconds=VERIFIED_RETENTION_SECONDS),
+            },
+            "$unset": {"session_id": "", "verify_attempts": ""},
+        }
+    )
+
+
 # --- Endpoints ---
-@router.post("/send", response_model=OTPResponse)
+@router.post("/send", response_model=OTPResponse, dependencies=[Depends(limit_by_ip(SEND_PER_IP_LIMIT))])
 async def send_otp(request: OTPSendRequest):
     """Send an OTP to the given phone number via 2Factor.in."""
     db = get_database()
     phone = request.phone
 
     # Check if OTP is globally completely disabled by admins
-    config = await db.system_settings.find_one({"_id": "global_config"})
-    is_otp_enabled = config.get("is_otp_enabled", True) if config else True
-    if not is_otp_enabled:
+    if not await get_system_settings().is_otp_enabled():
         return {"success": True, "message": "OTP is globally disabled. Proceed to next step."}
 
-    # Check API key is configured
-    if not settings.TWOFACTOR_API_KEY:
+    # Check the provider is configured (2Factor needs an API key)
+    provider = get_otp_provider()
+    if not provider.configured:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="OTP service is not configured"
         )
 
-    # Rate limiting: count recent OTP sends for this phone
-    now = datetime.now(timezone.utc)
-    rate_limit_cutoff = datetime.fromtimestamp(
-        now.timestamp() - RATE_LIMIT_WINDOW, tz=timezone.utc
-    )
-    recent_count = await db.otp_sessions.count_documents({
-        "phone": phone,
-        "created_at": {"$gte": rate_limit_cutoff}
-    })
-    if recent_count >= MAX_SEND_PER_PHONE:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=f"Too many OTP requests. Please try again after {RATE_LIMIT_WINDOW // 60} minutes."
-        )
-
-    # Call 2Factor API to send OTP (voice on trial, SMS with DLT in production)
-    url = f"{TWOFACTOR_BASE_URL}/{settings.TWOFACTOR_API_KEY}/SMS/{phone}/AUTOGEN"
-    try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.get(url)
-            data = response.json()
-    except httpx.RequestError as e:
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail=f"Failed to reach OTP provider: {str(e)}"
-        )
+    # Rate limiting: token bucket per phone. Only OTPs actually sent use a
+    # token, so retries during a provider outage don't lock the user out
+    send_limit_detail = "Too many OTP requests. Please try again in {wait}."
+    await check_rate_limit(SEND_PER_PHONE_LIMIT, phone, detail=send_limit_detail, cost=0)
 
-    if data.get("Status") != "Success":
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail=data.get("Details", "Failed to send OTP")
-        )
-
-    session_id = data["Details"]
+    # Ask the provider to send the OTP
+    session_id = await _call_provider(provider.send, phone)
+    await check_rate_limit(SEND_PER_PHONE_LIMIT, phone, detail=send_limit_detail)
+    now = datetime.now(timezone.utc)
 
     # Store session in DB
     await db.otp_sessions.insert_one({
@@ -132,13 +182,14 @@ async def send_otp(request: OTPSendRequest):
         "session_id": session_id,
         "created_at": now,
         "verify_attempts": 0,
-        "verified": False
+        "verified": False,
+        "expires_at": now + timedelta(seconds=SESSION_RETENTION_SECONDS),
     })
 
     return OTPResponse(success=True, message="OTP sent successfully")
 
 
-@router.post("/verify", response_model=OTPVerifyResponse)
+@router.post("/verify", response_model=OTPVerifyResponse, dependencies=[Depends(limit_by_ip(VERIFY_PER_IP_LIMIT))])
 async def verify_otp(request: OTPVerifyRequest):
     """Verify matching OTP from the database."""
     db = get_database()
@@ -146,17 +197,18 @@ async def verify_otp(request: OTPVerifyRequest):
     otp = request.otp
 
     # Check if OTP is globally completely disabled by admins
-    config = await db.system_settings.find_one({"_id": "global_config"})
-    is_otp_enabled = config.get("is_otp_enabled", True) if config else True
-    if not is_otp_enabled:
+    if not await get_system_settings().is_otp_enabled():
         return {"success": True, "verified": True, "message": "OTP is globally disabled. Successfully bypassed."}
 
-    if not settings.TWOFACTOR_API_KEY:
+    provider = get_otp_provider()
+    if not provider.configured:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="OTP service is not configured"
         )
 
+    await check_rate_limit(VERIFY_PER_PHONE_LIMIT, phone)
+
     # Find the most recent OTP session for this phone
     session = await db.otp_sessions.find_one(
         {"phone": phone, "verified": False},
@@ -187,31 +239,14 @@ async def verify_otp(request: OTPVerifyRequest):
 
     # Dev bypass: accept 1234 without calling 2Factor API
     if otp == DEV_BYPASS_OTP:
-        await db.otp_sessions.update_one(
-            {"_id": session["_id"]},
-            {"$set": {"verified": True}}
-        )
+        await _mark_verified(db, session["_id"], now)
         return OTPVerifyResponse(success=True, verified=True, message="Phone number verified")
 
-    # Call 2Factor API to verify
-    session_id = session["session_id"]
-    url = f"{TWOFACTOR_BASE_URL}/{settings.TWOFACTOR_API_KEY}/SMS/VERIFY/{session_id}/{otp}"
-    try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.get(url)
-            data = response.json()
-    except httpx.RequestError as e:
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail=f"Failed to reach OTP provider: {str(e)}"
-        )
+    # Ask the provider to verify
+    matched = await _call_provider(provider.verify, session["session_id"], otp)
 
-    if data.get("Status") == "Success" and data.get("Details") == "OTP Matched":
-        # Mark session as verified
-        await db.otp_sessions.update_one(
-            {"_id": session["_id"]},
-            {"$set": {"verified": True}}
-        )
+    if matched:
+        await _mark_verified(db, session["_id"], now)
         return OTPVerifyResponse(success=True, verified=True, message="Phone number verified")
 
     # OTP did not match — increment attempts
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 from typing import Optional
+from pymongo import ReturnDocument
 from app.core.database import get_database
+from app.core.system_settings import GLOBAL_CONFIG_ID, get_system_settings
 from app.api.deps import get_current_user
 from datetime import datetime
 
@@ -23,8 +25,7 @@ async def get_otp_settings():
     Publicly accessible endpoint (used by React app on boot).
     Tells the client whether it should enforce OTP UI or bypass it.
     """
-    db = get_database()
-    settings = await db.system_settings.find_one({"_id": "global_config"})
+    settings = await get_system_settings().get()
 
     # Default to True if setting doesn't exist yet
     if not settings:
@@ -42,15 +43,18 @@ async def update_otp_settings(request: SettingsUpdate, admin: dict = Depends(get
     Admin-only endpoint to toggle OTP enforcement globally.
     """
     db = get_database()
-    result = await db.system_settings.update_one(
-        {"_id": "global_config"},
+    config = await db.system_settings.find_one_and_update(
+        {"_id": GLOBAL_CONFIG_ID},
         {
             "$set": {
                 "is_otp_enabled": request.is_otp_enabled,
                 "updatedAt": datetime.utcnow()
             }
         },
-        upsert=True
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
     )
+    # Other workers pick this up from the change stream or their next poll
+    get_system_settings().set(config)
 
     return {"success": True, "message": f"OTP Enabled set to {request.is_otp_enabled}"}
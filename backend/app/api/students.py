@@ -3,25 +3,35 @@ Student API endpoints — onboarding, profile management, and applications.
 
 Authentication: Phone-based JWT tokens issued after OTP verification.
 """
+import asyncio
 import uuid
 from datetime import datetime, timedelta, timezone
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import Annotated, List
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from typing import Annotated, List, Optional
 from pydantic import BaseModel
+from pymongo import ReturnDocument
 
 from app.core.config import settings
 from app.core.database import get_database
+from app.core.catalog import get_catalog
+from app.core.system_settings import get_system_settings
+from app.core.recommend import top_k
 from app.core.security import create_access_token
+from app.core.pagination import fetch_page, field_projection
+from app.core.responses import ORJSONResponse
 from app.api.deps_student import get_current_student
 from app.models.student import (
     StudentOnboardRequest, StudentUpdateRequest, StudentResponse,
 )
 from app.models.application import (
-    ApplicationCreateRequest, ApplicationResponse,
+    APPLICATION_FIELDS, ApplicationCreateRequest, ApplicationResponse,
 )
 
 router = APIRouter()
 
+# Only the fields the API returns; keeps write responses to one small document
+STUDENT_PROJECTION = {name: 1 for name in StudentResponse.model_fields if name != "id"}
+
 
 def _generate_order_id() -> str:
     """Generate a unique order ID like NAV-2026-XXXX."""
@@ -44,52 +54,52 @@ async def onboard_student(request: StudentOnboardRequest):
     db = get_database()
     now = datetime.now(timezone.utc)
 
-    # Check if OTP is globally completely disabled by admins
-    config = await db.system_settings.find_one({"_id": "global_config"})
-    is_otp_enabled = config.get("is_otp_enabled", True) if config else True
-
-    # Verify that this phone was recently OTP-verified (if enabled)
-    if is_otp_enabled:
-        otp_session = await db.otp_sessions.find_one(
+    # Settings and the latest verified OTP session are independent; fetch both at once
+    is_otp_enabled, otp_session = await asyncio.gather(
+        get_system_settings().is_otp_enabled(),
+        db.otp_sessions.find_one(
             {"phone": request.phone, "verified": True},
+            {"_id": 1},
             sort=[("created_at", -1)],
+        ),
+    )
+
+    # Verify that this phone was recently OTP-verified (if enabled)
+    if is_otp_enabled and not otp_session:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Phone number not verified. Please complete OTP verification first.",
         )
-        if not otp_session:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Phone number not verified. Please complete OTP verification first.",
-            )
 
     # Build the student document
     student_data = request.model_dump(exclude_none=True)
     student_data["phoneVerified"] = True
     student_data["updatedAt"] = now
 
-    # Upsert: create if new, update if exists
-    result = await db.students.update_one(
+    # Upsert (create if new, update if exists) and get the saved record back
+    student = await db.students.find_one_and_update(
         {"phone": request.phone},
         {
             "$set": student_data,
             "$setOnInsert": {"createdAt": now},
         },
+        projection=STUDENT_PROJECTION,
         upsert=True,
+        return_document=ReturnDocument.AFTER,
     )
 
-    # Fetch the full student record
-    student = await db.students.find_one({"phone": request.phone})
-
     # Issue JWT with phone + role
     token = create_access_token(
         data={"sub": request.phone, "role": "student"},
         expires_delta=timedelta(days=30),
     )
 
-    return {
+    return ORJSONResponse({
         "success": True,
         "message": "Student profile saved",
         "token": token,
-        "student": _serialize_student(student),
-    }
+        "student": student,
+    })
 
 # ─────────────────────────────────────────────
 #  Dev Login (No OTP)
@@ -107,12 +117,12 @@ async def dev_login(request: DevLoginRequest):
     
     # Generate JWT directly
     token = create_student_token({"sub": request.phone})
-    return {
+    return ORJSONResponse({
         "success": True,
         "message": "Dev login successful",
         "token": token,
-        "student": _serialize_student(student),
-    }
+        "student": student,
+    })
 
 # ─────────────────────────────────────────────
 #  Profile (authenticated)
@@ -121,10 +131,10 @@ async def dev_login(request: DevLoginRequest):
 async def get_my_profile(phone: str = Depends(get_current_student)):
     """Get the current student's profile."""
     db = get_database()
-    student = await db.students.find_one({"phone": phone})
+    student = await db.students.find_one({"phone": phone}, STUDENT_PROJECTION)
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
-    return _serialize_student(student)
+    return ORJSONResponse(student)
 
 
 @router.patch("/me")
@@ -140,12 +150,39 @@ async def update_my_profile(
 
     update_data["updatedAt"] = datetime.now(timezone.utc)
 
-    await db.students.update_one(
+    student = await db.students.find_one_and_update(
         {"phone": phone},
         {"$set": update_data},
+        projection=STUDENT_PROJECTION,
+        return_document=ReturnDocument.AFTER,
+    )
+    if not student:
+        raise HTTPException(status_code=404, detail="Student not found")
+    return ORJSONResponse(student)
+
+
+@router.get("/me/recommendations")
+async def get_my_recommendations(
+    limit: int = Query(6, ge=1, le=50),
+    phone: str = Depends(get_current_student),
+):
+    """Colleges ranked for the current student (same ranking as recommend.js)."""
+    db = get_database()
+    student = await db.students.find_one(
+        {"phone": phone}, {"examScores": 1, "homeState": 1}
+    )
+    if not student:
+        raise HTTPException(status_code=404, detail="Student not found")
+
+    snapshot = await get_catalog().get()
+    scores = snapshot.recommendations.score_student(
+        student.get("examScores"), student.get("homeState")
     )
-    student = await db.students.find_one({"phone": phone})
-    return _serialize_student(student)
+    return ORJSONResponse({
+        "recommendations": [
+            snapshot.colleges[pos] for pos in top_k(scores, limit)
+        ]
+    })
 
 
 # ─────────────────────────────────────────────
@@ -177,26 +214,37 @@ async def create_application(
     result = await db.applications.insert_one(app_doc)
     app_doc["_id"] = str(result.inserted_id)
 
-    return {
+    return ORJSONResponse({
         "success": True,
         "message": "Application created",
-        "application": _serialize_application(app_doc),
-    }
+        "application": app_doc,
+    })
 
 
 @router.get("/applications")
-async def get_my_applications(phone: str = Depends(get_current_student)):
-    """Get all applications for the current student."""
+async def get_my_applications(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    phone: str = Depends(get_current_student),
+):
+    """
+    The current student's applications, newest first.
+    Pass `nextCursor` from a response as `cursor` to get the next page.
+    """
     db = get_database()
-    cursor = db.applications.find(
-        {"studentPhone": phone}
-    ).sort("createdAt", -1)
-
-    applications = []
-    async for doc in cursor:
-        applications.append(_serialize_application(doc))
+    try:
+        docs, next_cursor = await fetch_page(
+            db.applications, {"studentPhone": phone}, limit, cursor,
+            field_projection(fields, APPLICATION_FIELDS),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return {"applications": applications}
+    return ORJSONResponse({
+        "applications": docs,
+        "nextCursor": next_cursor,
+    })
 
 
 @router.get("/applications/{order_id}")
@@ -212,31 +260,4 @@ async def get_application(
     })
     if not app_doc:
         raise HTTPException(status_code=404, detail="Application not found")
-    return _serialize_application(app_doc)
-
-
-# ─────────────────────────────────────────────
-#  Helpers
-# ─────────────────────────────────────────────
-def _serialize_student(doc: dict) -> dict:
-    """Convert a MongoDB student document to a JSON-safe dict."""
-    if doc is None:
-        return None
-    doc["_id"] = str(doc["_id"])
-    # Convert datetime objects
-    for key in ("createdAt", "updatedAt"):
-        if key in doc and doc[key]:
-            doc[key] = doc[key].isoformat()
-    return doc
-
-
-def _serialize_application(doc: dict) -> dict:
-    """Convert a MongoDB application document to a JSON-safe dict."""
-    if doc is None:
-        return None
-    if "_id" in doc:
-        doc["_id"] = str(doc["_id"])
-    for key in ("createdAt", "updatedAt"):
-        if key in doc and doc[key]:
-            doc[key] = doc[key].isoformat()
-    return doc
+    return ORJSONResponse(app_doc)
@@ -0,0 +1,230 @@
+"""
+In-process college catalog cache.
+
+The catalog only changes when an admin writes to it, so the read endpoints
+serve a validated in-memory snapshot instead of querying Mongo per request.
+
+Consistency across uvicorn workers:
+  1. Every catalog write bumps a shared version counter stored in
+     `system_settings` (`_id: "catalog_state"`).
+  2. Each worker re-checks that counter at most once every
+     CATALOG_CACHE_TTL_SECONDS and reloads its snapshot when it moved.
+  3. The worker that performed the write patches its own snapshot in place
+     (re-reading that college) when no other write happened in between,
+     otherwise it reloads.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from pymongo import ReturnDocument
+
+from app.core.catalog_index import CatalogIndex
+from app.core.compression import PrecompressedBody
+from app.core.config import settings
+from app.core.recommend import RecommendationFeatures
+from app.core.responses import dumps
+from app.core.database import get_database
+from app.models.college import CollegeInDB
+
+CATALOG_STATE_ID = "catalog_state"
+# Distinct (skip, limit, fields) pages / (id, fields) colleges kept pre-encoded per snapshot
+MAX_ENCODED_PAGES = 64
+MAX_ENCODED_COLLEGES = 4096
+
+
+class CatalogSnapshot:
+    """Immutable view of the colleges collection at a given version."""
+
+    def __init__(self, version: int, colleges: List[dict]):
+        self.version = version
+        self.colleges = colleges
+        self.by_id: Dict[str, dict] = {c["id"]: c for c in colleges}
+        self.loaded_at = time.monotonic()
+        # Content fingerprints — identical catalogs hash the same on every worker
+        self._hashes: Dict[str, str] = {c["id"]: _content_hash(c) for c in colleges}
+        self.content_hash = hashlib.sha256(
+            "".join(self._hashes[c["id"]] for c in colleges).encode("utf-8")
+        ).hexdigest()
+        self.index = CatalogIndex(colleges)
+        # JSON bodies (and their gzip / br variants), encoded on first request
+        # and reused until the next version
+        self._encoded_pages: Dict[tuple, PrecompressedBody] = {}
+        self._encoded_colleges: Dict[tuple, PrecompressedBody] = {}
+
+    @cached_property
+    def recommendations(self) -> RecommendationFeatures:
+        return RecommendationFeatures(self.colleges)
+
+    def get(self, college_id: str) -> Optional[dict]:
+        return self.by_id.get(college_id)
+
+    def get_many(self, college_ids: List[str]) -> Tuple[List[dict], List[str]]:
+        """(colleges found, in request order without repeats; ids not in the catalog)."""
+        found, missing = [], []
+        for college_id in dict.fromkeys(college_ids):
+            college = self.by_id.get(college_id)
+            if college is None:
+                missing.append(college_id)
+            else:
+                found.append(college)
+        return found, missing
+
+    def hash_of(self, college_id: str) -> Optional[str]:
+        return self._hashes.get(college_id)
+
+    def page(self, skip: int, limit: int, fields: Optional[Tuple[str, ...]] = None) -> List[dict]:
+        return [project(c, fields) for c in self.colleges[skip:skip + limit]]
+
+    def encoded_page(self, skip: int, limit: int, fields: Optional[Tuple[str, ...]] = None) -> PrecompressedBody:
+        """page(skip, limit, fields) as JSON bytes."""
+        # Pages past the end are all the same slice; share one key for them
+        skip = min(skip, len(self.colleges))
+        limit = min(limit, len(self.colleges) - skip)
+        key = (skip, limit, fields)
+        body = self._encoded_pages.get(key)
+        if body is None:
+            if len(self._encoded_pages) >= MAX_ENCODED_PAGES:
+                # Drop the oldest page only, so popular pages outlive one-off ones
+                del self._encoded_pages[next(iter(self._encoded_pages))]
+            body = self._encoded_pages[key] = PrecompressedBody(dumps(self.page(skip, limit, fields)))
+        return body
+
+    def encoded(self, college_id: str, fields: Optional[Tuple[str, ...]] = None) -> Optional[PrecompressedBody]:
+        """One college as JSON bytes, or None if it isn't in the catalog."""
+        key = (college_id, fields)
+        body = self._encoded_colleges.get(key)
+        if body is None and college_id in self.by_id:
+            if len(self._encoded_colleges) >= MAX_ENCODED_COLLEGES:
+                del self._encoded_colleges[next(iter(self._encoded_colleges))]
+            body = self._encoded_colleges[key] = PrecompressedBody(dumps(project(self.by_id[college_id], fields)))
+        return body
+
+
+def project(entry: dict, fields: Optional[Tuple[str, ...]]) -> dict:
+    """`entry` trimmed to `fields` (all fields when None)."""
+    if fields is None:
+        return entry
+    return {name: entry[name] for name in fields if name in entry}
+
+
+def _content_hash(entry: dict) -> str:
+    payload = json.dumps(entry, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _to_entry(doc: dict) -> Optional[dict]:
+    """
+    Validate a raw Mongo document once and keep its API representation.
+    Invalid documents are logged and left out of the catalog (None).
+    """
+    try:
+        return CollegeInDB(**doc).model_dump(by_alias=True, mode="json")
+    except ValidationError as e:
+        print(f"Skipping college {doc.get('id', doc.get('_id'))} in catalog: {e.error_count()} invalid field(s)")
+        return None
+
+
+async def _patch(db, colleges: List[dict], college_id: str) -> List[dict]:
+    """
+    `colleges` with one college replaced by its stored state (or dropped).
+
+    The document is read under the cache lock rather than taken from the
+    caller: concurrent writes to one college can reach Mongo in a different
+    order than they reach the cache.
+    """
+    doc = await db.colleges.find_one({"id": college_id})
+    entry = _to_entry(doc) if doc is not None else None
+    if entry is None:
+        return [c for c in colleges if c["id"] != college_id]
+    patched = [entry if c["id"] == college_id else c for c in colleges]
+    if college_id not in {c["id"] for c in colleges}:
+        patched.append(entry)
+    return patched
+
+
+class CatalogCache:
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def _read_version(self, db) -> int:
+        state = await db.system_settings.find_one({"_id": CATALOG_STATE_ID})
+        return state.get("version", 0) if state else 0
+
+    async def _load(self, db, version: int) -> CatalogSnapshot:
+        colleges = []
+        skipped = 0
+        async for doc in db.colleges.find():
+            entry = _to_entry(doc)
+            if entry is None:
+                skipped += 1
+            else:
+                colleges.append(entry)
+        if skipped:
+            print(f"Catalog version {version} loaded without {skipped} invalid college(s)")
+        return CatalogSnapshot(version, colleges)
+
+    async def get(self) -> CatalogSnapshot:
+        """Return the current snapshot, reloading it if another worker wrote."""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self.ttl_seconds:
+            return snapshot
+
+        async with self._lock:
+            # Another coroutine may have refreshed while we waited
+            if self._snapshot is not None and time.monotonic() - self._checked_at < self.ttl_seconds:
+                return self._snapshot
+
+            db = get_database()
+            version = await self._read_version(db)
+            if self._snapshot is None or self._snapshot.version != version:
+                self._snapshot = await self._load(db, version)
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+    async def _bump_version(self, db) -> int:
+        state = await db.system_settings.find_one_and_update(
+            {"_id": CATALOG_STATE_ID},
+            {"$inc": {"version": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return state["version"]
+
+    async def _apply(self, college_id: Optional[str] = None) -> None:
+        db = get_database()
+        async with self._lock:
+            version = await self._bump_version(db)
+            current = self._snapshot
+            if current is not None and college_id is not None and current.version == version - 1:
+                # Only our own write happened since the last load: patch in place
+                self._snapshot = CatalogSnapshot(version, await _patch(db, current.colleges, college_id))
+            else:
+                self._snapshot = await self._load(db, version)
+            self._checked_at = time.monotonic()
+
+    async def upsert(self, doc: dict) -> None:
+        """Record a created or updated college document."""
+        await self._apply(doc["id"])
+
+    async def remove(self, college_id: str) -> None:
+        """Record a deleted college."""
+        await self._apply(college_id)
+
+    async def invalidate(self) -> None:
+        """Record a bulk write; the snapshot is reloaded from Mongo."""
+        await self._apply(None)
+
+
+catalog = CatalogCache(ttl_seconds=settings.CATALOG_CACHE_TTL_SECONDS)
+
+
+def get_catalog() -> CatalogCache:
+    return catalog
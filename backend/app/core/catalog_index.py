@@ -0,0 +1,222 @@
+"""
+In-memory search index over a catalog snapshot.
+
+Every college gets a position in the snapshot; sets of colleges are Python
+ints used as bitsets (bit i set → college at position i is included).
+Filters are answered by AND-ing precomputed bitsets, so a query never
+scans the catalog:
+  - text:      token → bitset, prefix-matched against a sorted vocabulary
+  - facets:    field → value → bitset, also used for per-value counts
+  - flags:     hostel / NIRF-ranked bitsets
+  - ranges:    "field >= x" / "field <= x" bitsets, one per distinct value
+  - sorting:   positions pre-sorted per sort key
+"""
+import re
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional
+
+from app.models.college import CollegeSearchFilters
+
+TOKEN_REGEX = re.compile(r"[a-z0-9]+")
+
+# Fields whose words are searchable through `q` (mirrors DiscoveryPage search)
+TEXT_FIELDS = ("name", "city", "courses")
+
+# Fields that can be filtered on by exact value, and reported as facets
+FACET_FIELDS = ("collegeType", "category", "state", "courses", "entranceExams", "accreditation")
+
+# Sort key → college field
+SORT_FIELDS = {
+    "name": "name",
+    "rating": "rating",
+    "placement": "placementPercent",
+    "nirfRank": "nirfRank",
+    "year": "year",
+    "fees": "feesLakhs",
+    "avgPackage": "avgPackageLpa",
+    "medianPackage": "medianPackageLpa",
+}
+
+# Numeric range filter → (college field, bound); placement is handled apart
+# since 0 means "no filter" there
+RANGE_FILTERS = {
+    "maxFeesLakhs": ("feesLakhs", "max"),
+    "minAvgPackageLpa": ("avgPackageLpa", "min"),
+    "minMedianPackageLpa": ("medianPackageLpa", "min"),
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_REGEX.findall(text.lower())
+
+
+def _values(college: dict, field: str) -> List[str]:
+    value = college.get(field)
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [v for v in value if v]
+    return [value]
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Yield the positions of set bits, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class RangeIndex:
+    """Bitsets answering "value >= x" and "value <= x" with one binary search."""
+
+    def __init__(self, bits_by_value: Dict[float, int]):
+        self.values = sorted(bits_by_value)
+        # at_least[i]: every college with value >= values[i]; at_most[i]: <= values[i]
+        self.at_least: List[int] = [0] * len(self.values)
+        self.at_most: List[int] = [0] * len(self.values)
+        running = 0
+        for i in range(len(self.values) - 1, -1, -1):
+            running |= bits_by_value[self.values[i]]
+            self.at_least[i] = running
+        running = 0
+        for i, value in enumerate(self.values):
+            running |= bits_by_value[value]
+            self.at_most[i] = running
+
+    def minimum(self, bound: float) -> int:
+        i = bisect_left(self.values, bound)
+        return self.at_least[i] if i < len(self.values) else 0
+
+    def maximum(self, bound: float) -> int:
+        i = bisect_right(self.values, bound)
+        return self.at_most[i - 1] if i > 0 else 0
+
+
+class CatalogIndex:
+    def __init__(self, colleges: List[dict]):
+        self.size = len(colleges)
+        self.all = (1 << self.size) - 1
+
+        tokens: Dict[str, int] = {}
+        self.facets: Dict[str, Dict[str, int]] = {field: {} for field in FACET_FIELDS}
+        self.hostel = 0
+        self.nirf_ranked = 0
+        placements: Dict[float, int] = {}
+        ranges: Dict[str, Dict[float, int]] = {field: {} for field, _ in RANGE_FILTERS.values()}
+
+        for pos, college in enumerate(colleges):
+            bit = 1 << pos
+            for field in TEXT_FIELDS:
+                for value in _values(college, field):
+                    for token in tokenize(str(value)):
+                        tokens[token] = tokens.get(token, 0) | bit
+            for field in FACET_FIELDS:
+                values = self.facets[field]
+                for value in _values(college, field):
+                    values[value] = values.get(value, 0) | bit
+            if college.get("hostelAvailable") is True:
+                self.hostel |= bit
+            if college.get("nirfRank") is not None:
+                self.nirf_ranked |= bit
+            placement = college.get("placementPercent")
+            if placement:
+                placements[placement] = placements.get(placement, 0) | bit
+            for field, values in ranges.items():
+                value = college.get(field)
+                if value is not None:
+                    values[value] = values.get(value, 0) | bit
+
+        self.tokens = tokens
+        self.vocabulary = sorted(tokens)
+
+        self.placement = RangeIndex(placements)
+        self.ranges = {field: RangeIndex(values) for field, values in ranges.items()}
+
+        # Missing values always sort last, whatever the direction
+        self.orders: Dict[str, List[int]] = {}
+        for key, field in SORT_FIELDS.items():
+            present = [pos for pos, c in enumerate(colleges) if c.get(field) is not None]
+            missing = [pos for pos, c in enumerate(colleges) if c.get(field) is None]
+            sort_value = (lambda pos: str(colleges[pos][field]).lower()) if key == "name" else (lambda pos: colleges[pos][field])
+            present.sort(key=sort_value)
+            self.orders[key] = present + missing
+            self.orders[f"-{key}"] = sorted(present, key=sort_value, reverse=True) + missing
+
+    def _prefix(self, token: str) -> int:
+        """Bitset of colleges having any word that starts with `token`."""
+        mask = 0
+        i = bisect_left(self.vocabulary, token)
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(token):
+            mask |= self.tokens[self.vocabulary[i]]
+            i += 1
+        return mask
+
+    def _any_of(self, field: str, values: List[str]) -> int:
+        mask = 0
+        for value in values:
+            mask |= self.facets[field].get(value, 0)
+        return mask
+
+    def _match_non_facets(self, filters: CollegeSearchFilters) -> int:
+        mask = self.all
+        if filters.q:
+            for token in tokenize(filters.q):
+                mask &= self._prefix(token)
+        if filters.minPlacement > 0:
+            mask &= self.placement.minimum(filters.minPlacement)
+        for name, (field, bound) in RANGE_FILTERS.items():
+            value = getattr(filters, name)
+            if value is not None:
+                ranges = self.ranges[field]
+                mask &= ranges.minimum(value) if bound == "min" else ranges.maximum(value)
+        if filters.hostel:
+            mask &= self.hostel
+        if filters.nirfOnly:
+            mask &= self.nirf_ranked
+        return mask
+
+    def _apply_facets(self, mask: int, filters: CollegeSearchFilters, exclude: Optional[str] = None) -> int:
+        for field in FACET_FIELDS:
+            selected = getattr(filters, field)
+            if selected and field != exclude:
+                mask &= self._any_of(field, selected)
+        return mask
+
+    def match(self, filters: CollegeSearchFilters) -> int:
+        """Return the bitset of colleges matching every filter."""
+        return self._apply_facets(self._match_non_facets(filters), filters)
+
+    def facet_counts(self, filters: CollegeSearchFilters) -> Dict[str, List[dict]]:
+        """
+        Count matching colleges per facet value.
+
+        Each facet is counted with every filter applied except its own, so
+        the counts say how many results picking that option would give.
+        Values with no matches are kept (count 0) so options stay visible.
+        """
+        base = self._match_non_facets(filters)
+        counts = {}
+        for field in FACET_FIELDS:
+            mask = self._apply_facets(base, filters, exclude=field)
+            values = [
+                {"value": value, "count": (mask & bits).bit_count()}
+                for value, bits in self.facets[field].items()
+            ]
+            values.sort(key=lambda v: (-v["count"], str(v["value"])))
+            counts[field] = values
+        return counts
+
+    def select(self, mask: int, sort: Optional[str], skip: int, limit: int) -> List[int]:
+        """Return positions of one page of `mask`, in `sort` order (catalog order if None)."""
+        if sort is None:
+            ordered = iter_bits(mask)
+        else:
+            ordered = (pos for pos in self.orders[sort] if mask >> pos & 1)
+        page = []
+        for i, pos in enumerate(ordered):
+            if i >= skip + limit:
+                break
+            if i >= skip:
+                page.append(pos)
+        return page
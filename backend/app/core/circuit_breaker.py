@@ -0,0 +1,155 @@
+"""
+Circuit breaker for calls to external services.
+
+States:
+  - closed:    calls go through; outcomes are recorded in a rolling window.
+               When the window holds at least `min_calls` and the share of
+               failures or slow calls crosses its ratio, the circuit opens.
+  - open:      calls fail immediately with CircuitOpenError for
+               `open_seconds`, so a struggling provider can't hold
+               request workers hostage.
+  - half_open: up to `half_open_max_calls` probe calls are let through.
+               A fast success closes the circuit; a failure or slow call
+               opens it again.
+
+Every call also runs under a latency budget (`timeout_seconds`); a call
+that overruns it is cancelled and counts as a failure.
+"""
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Tuple, Type
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling while the circuit is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} circuit is open")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        timeout_seconds: float,
+        window_seconds: float = 60,
+        min_calls: int = 5,
+        failure_ratio: float = 0.5,
+        slow_call_seconds: float = 2.0,
+        slow_ratio: float = 0.8,
+        open_seconds: float = 30,
+        half_open_max_calls: int = 1,
+        failure_exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+    ):
+        self.name = name
+        self.timeout_seconds = timeout_seconds
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_ratio = slow_ratio
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.failure_exceptions = failure_exceptions
+
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        # (finished_at, failed, slow) per call in the rolling window
+        self._calls = deque()
+        self._counters = {"calls": 0, "failures": 0, "timeouts": 0, "slow": 0, "rejected": 0}
+        self._transitions = {}
+        self._last_transition_at = None
+
+    def _transition(self, state: str) -> None:
+        key = f"{self.state}->{state}"
+        self._transitions[key] = self._transitions.get(key, 0) + 1
+        self._last_transition_at = datetime.now(timezone.utc)
+        print(f"Circuit {self.name}: {key}")
+        self.state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        if state == CLOSED:
+            self._calls.clear()
+        self._probes = 0
+
+    def _prune(self, now: float) -> None:
+        while self._calls and now - self._calls[0][0] > self.window_seconds:
+            self._calls.popleft()
+
+    def _before_call(self) -> None:
+        if self.state == OPEN:
+            remaining = self.open_seconds - (time.monotonic() - self._opened_at)
+            if remaining > 0:
+                self._counters["rejected"] += 1
+                raise CircuitOpenError(self.name, remaining)
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probes >= self.half_open_max_calls:
+                self._counters["rejected"] += 1
+                raise CircuitOpenError(self.name, self.open_seconds)
+            self._probes += 1
+
+    def _record(self, failed: bool, elapsed: float) -> None:
+        slow = elapsed >= self.slow_call_seconds
+        self._counters["calls"] += 1
+        self._counters["failures"] += failed
+        self._counters["slow"] += slow
+
+        if self.state == HALF_OPEN:
+            self._transition(OPEN if failed or slow else CLOSED)
+            return
+
+        now = time.monotonic()
+        self._calls.append((now, failed, slow))
+        self._prune(now)
+        total = len(self._calls)
+        if self.state == CLOSED and total >= self.min_calls:
+            failures = sum(1 for _, f, _ in self._calls if f)
+            slow_calls = sum(1 for _, _, s in self._calls if s)
+            if failures / total >= self.failure_ratio or slow_calls / total >= self.slow_ratio:
+                self._transition(OPEN)
+
+    async def call(self, fn: Callable[..., Awaitable], *args, **kwargs):
+        """Run `fn` through the breaker; raises CircuitOpenError or asyncio.TimeoutError."""
+        self._before_call()
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(fn(*args, **kwargs), self.timeout_seconds)
+        except asyncio.TimeoutError:
+            self._counters["timeouts"] += 1
+            self._record(True, time.monotonic() - started)
+            raise
+        except self.failure_exceptions:
+            self._record(True, time.monotonic() - started)
+            raise
+        except BaseException:
+            # Not the provider's fault (e.g. client disconnect); free the probe slot
+            if self.state == HALF_OPEN:
+                self._probes -= 1
+            raise
+        self._record(False, time.monotonic() - started)
+        return result
+
+    def metrics(self) -> dict:
+        now = time.monotonic()
+        self._prune(now)
+        window = len(self._calls)
+        return {
+            "state": self.state,
+            "window": {
+                "calls": window,
+                "failures": sum(1 for _, f, _ in self._calls if f),
+                "slow": sum(1 for _, _, s in self._calls if s),
+            },
+            "totals": dict(self._counters),
+            "transitions": dict(self._transitions),
+            "lastTransitionAt": self._last_transition_at,
+        }
@@ -0,0 +1,197 @@
+"""
+College spreadsheet import pipeline.
+
+Flow:
+  1. parse     — read the CSV/Excel upload into a DataFrame
+  2. clean     — column-wise pandas operations: trim text, split list
+                 columns, fold lat/lng into coordinates, drop blanks
+  3. validate  — each row against CollegeCreate, collecting per-row errors,
+                 derive the numeric fields (app.core.normalize) and
+                 fingerprint it with a content hash
+  4. diff      — compare fingerprints with the `importHash` stored on each
+                 college: added / changed / unchanged / removed
+  5. write     — unordered bulk_write batches of UpdateOne(upsert=True),
+                 for added and changed rows only
+
+Steps 1-3 are CPU-bound and synchronous (run them off the event loop);
+steps 4-5 are async.
+
+`importHash` is the hash of the row that last wrote a college. Edits made
+through the API clear it, so the next import rewrites that college.
+"""
+import hashlib
+import io
+import json
+import time
+from typing import List, Optional, Tuple
+
+import pandas as pd
+from pydantic import ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.core.normalize import NUMERIC_FIELDS, derived_fields
+from app.models.college import CollegeCreate
+
+# Columns holding "a, b, c" lists in the spreadsheet
+LIST_FIELDS = ["topRecruiters", "accreditation", "entranceExams", "courses"]
+IMPORT_BATCH_SIZE = 1000
+
+STRING_FIELDS = [
+    name for name, field in CollegeCreate.model_fields.items()
+    if field.annotation in (str, Optional[str])
+]
+
+
+class PreparedImport:
+    """Validated rows ready to be written, plus everything that went wrong."""
+
+    def __init__(self):
+        self.rows: List[Tuple[str, dict]] = []  # (row label, $set document)
+        self.errors: List[str] = []
+        self.timing = {}
+
+
+def _ms(started: float) -> int:
+    return int((time.perf_counter() - started) * 1000)
+
+
+def read_upload(filename: str, contents: bytes) -> pd.DataFrame:
+    if filename.endswith('.csv'):
+        return pd.read_csv(io.BytesIO(contents))
+    if filename.endswith(('.xls', '.xlsx')):
+        return pd.read_excel(io.BytesIO(contents))
+    raise ValueError("Invalid file format")
+
+
+def clean_frame(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.dropna(how="all")
+
+    for column in df.columns.intersection(STRING_FIELDS):
+        text = df[column].astype(str).str.strip()
+        df[column] = text.where(df[column].notna() & (text != ""))
+
+    for column in df.columns.intersection(LIST_FIELDS):
+        items = df[column].astype("string").str.split(",")
+        df[column] = items.map(lambda parts: [p.strip() for p in parts if p.strip()], na_action="ignore")
+
+    if "lat" in df.columns and "lng" in df.columns and "coordinates" not in df.columns:
+        has_coords = df["lat"].notna() & df["lng"].notna()
+        coords = pd.Series(
+            [{"lat": lat, "lng": lng} for lat, lng in zip(df["lat"], df["lng"])], index=df.index
+        )
+        df["coordinates"] = coords.where(has_coords)
+        df = df.drop(columns=["lat", "lng"])
+
+    # object dtype so missing values come out as None rather than NaN
+    return df.astype(object).where(df.notna(), None)
+
+
+def row_hash(document: dict) -> str:
+    payload = json.dumps(document, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def validate_rows(df: pd.DataFrame, prepared: PreparedImport) -> None:
+    model_fields = set(CollegeCreate.model_fields)
+    rows = {}
+    for index, record in zip(df.index, df.to_dict("records")):
+        data = {k: v for k, v in record.items() if v is not None}
+        if "id" not in data:
+            prepared.errors.append(f"Row {index}: Missing ID")
+            continue
+        try:
+            college = CollegeCreate(**data)
+        except ValidationError as e:
+            problems = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            )
+            prepared.errors.append(f"Row {index} (ID {data['id']}): {problems}")
+            continue
+
+        # Only write the columns the sheet provides; keep unknown columns as-is.
+        # Numeric fields always come from the text, never from the sheet.
+        document = college.model_dump(exclude_unset=True)
+        document.update({k: v for k, v in data.items() if k not in model_fields and k not in NUMERIC_FIELDS})
+        document.update(derived_fields(document))
+        document["importHash"] = row_hash(document)
+
+        # A repeated ID within the sheet: the later row wins
+        if college.id in rows:
+            prepared.errors.append(f"Row {index}: Duplicate ID {college.id}, replaces {rows[college.id][0]}")
+        rows[college.id] = (f"Row {index}", document)
+    prepared.rows = list(rows.values())
+
+
+def prepare_import(filename: str, contents: bytes) -> PreparedImport:
+    """Parse, clean and validate an upload. Raises ValueError on unsupported files."""
+    prepared = PreparedImport()
+
+    started = time.perf_counter()
+    df = clean_frame(read_upload(filename, contents))
+    prepared.timing["parse_ms"] = _ms(started)
+
+    started = time.perf_counter()
+    validate_rows(df, prepared)
+    prepared.timing["validate_ms"] = _ms(started)
+    return prepared
+
+
+async def diff_import(db, prepared: PreparedImport) -> dict:
+    """Classify sheet rows against the stored catalog by content hash."""
+    stored = {}
+    async for doc in db.colleges.find({}, {"_id": 0, "id": 1, "importHash": 1}):
+        stored[doc.get("id")] = doc.get("importHash")
+
+    diff = {"added": [], "changed": [], "unchanged": [], "removed": []}
+    sheet_ids = set()
+    for _, doc in prepared.rows:
+        sheet_ids.add(doc["id"])
+        if doc["id"] not in stored:
+            diff["added"].append(doc["id"])
+        elif stored[doc["id"]] == doc["importHash"]:
+            diff["unchanged"].append(doc["id"])
+        else:
+            diff["changed"].append(doc["id"])
+    # Reported only — colleges missing from the sheet are never deleted
+    diff["removed"] = [college_id for college_id in stored if college_id not in sheet_ids]
+    return diff
+
+
+async def write_import(db, prepared: PreparedImport, diff: dict, on_progress=None) -> dict:
+    """
+    Upsert added and changed rows by college id in unordered bulk batches.
+
+    `on_progress(results)` is awaited after each batch, if given.
+    """
+    results = {
+        "rowsProcessed": 0, "inserted": 0, "updated": 0,
+        "unchanged": len(diff["unchanged"]), "errors": list(prepared.errors),
+    }
+    unchanged = set(diff["unchanged"])
+    rows = [(label, doc) for label, doc in prepared.rows if doc["id"] not in unchanged]
+
+    started = time.perf_counter()
+    for offset in range(0, len(rows), IMPORT_BATCH_SIZE):
+        batch = rows[offset:offset + IMPORT_BATCH_SIZE]
+        operations = [
+            UpdateOne({"id": doc["id"]}, {"$set": doc}, upsert=True) for _, doc in batch
+        ]
+        try:
+            result = await db.colleges.bulk_write(operations, ordered=False)
+            results["inserted"] += result.upserted_count
+            results["updated"] += result.matched_count
+        except BulkWriteError as e:
+            details = e.details
+            results["inserted"] += details.get("nUpserted", 0)
+            results["updated"] += details.get("nMatched", 0)
+            for error in details.get("writeErrors", []):
+                label, doc = batch[error["index"]]
+                results["errors"].append(f"{label} (ID {doc['id']}): {error.get('errmsg')}")
+
+        results["rowsProcessed"] += len(batch)
+        if on_progress is not None:
+            await on_progress(results)
+
+    results["timing"] = dict(prepared.timing, write_ms=_ms(started))
+    return results
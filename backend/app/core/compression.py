@@ -0,0 +1,148 @@
+"""
+Response compression — gzip and Brotli negotiated from Accept-Encoding.
+
+Two paths:
+  - CompressionMiddleware compresses ordinary JSON/text responses of at
+    least COMPRESSION_MIN_SIZE bytes on the fly. Responses that already
+    carry a Content-Encoding, and streamed bodies (exports), pass through.
+  - PrecompressedBody holds a body that is served many times unchanged
+    (catalog pages) together with its compressed variants, each computed
+    once on first use at a higher compression level (in a worker thread,
+    so a cold variant doesn't block the event loop).
+
+Brotli is used when the `brotli` package is installed; gzip otherwise.
+"""
+import gzip
+from typing import Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Preferred first when the client accepts several equally
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli else ("gzip",)
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+# On-the-fly levels favour speed; precompressed bodies are compressed once
+FAST_LEVELS = {"br": 4, "gzip": 6}
+PRECOMPRESSED_LEVELS = {"br": 9, "gzip": 9}
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best supported encoding the client accepts, or None."""
+    if not accept_encoding:
+        return None
+    accepted: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    best, best_q = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class PrecompressedBody:
+    """An encoded body plus lazily computed gzip / br variants."""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self._variants: Dict[str, bytes] = {}
+
+    def ready(self, encoding: Optional[str]) -> bool:
+        """True when variant(encoding) is instant (no compression to run)."""
+        return encoding is None or len(self.body) < settings.COMPRESSION_MIN_SIZE or encoding in self._variants
+
+    def variant(self, encoding: Optional[str]) -> Tuple[Optional[str], bytes]:
+        """(Content-Encoding or None, bytes) to send for a negotiated encoding."""
+        if encoding is None or len(self.body) < settings.COMPRESSION_MIN_SIZE:
+            return None, self.body
+        compressed = self._variants.get(encoding)
+        if compressed is None:
+            compressed = self._variants[encoding] = compress(
+                self.body, encoding, PRECOMPRESSED_LEVELS[encoding]
+            )
+        return encoding, compressed
+
+
+def _compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "")
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def compressing_send(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                # Hold the headers until we know how big the body is
+                start_message = message
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or not _compressible(headers)
+                or len(body) < self.minimum_size
+            ):
+                # Streamed, already encoded, or too small to be worth it
+                if _compressible(headers):
+                    headers.add_vary_header("Accept-Encoding")
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            body = compress(body, encoding, FAST_LEVELS[encoding])
+            headers["Content-Encoding"] = encoding
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                # Bytes differ from the identity body, so the tag can only be weak
+                headers["ETag"] = "W/" + etag
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, compressing_send)
@@ -6,8 +6,26 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "dev_secret_key_change_in_prod"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7 # 1 week for dev
+    BCRYPT_ROUNDS: int = 12  # Changing this rehashes each admin password at its next login
+    PASSWORD_HASH_WORKERS: int = 2  # Threads running bcrypt off the event loop
+    AUTH_CACHE_TTL_SECONDS: float = 30.0  # How long a worker trusts a cached admin token / user
+    AUTH_CACHE_SIZE: int = 1024  # Entries per auth cache
     TWOFACTOR_API_KEY: str = ""
     TWOFACTOR_OTP_TEMPLATE: str = "NavikshaOTP"
+    OTP_PROVIDER: str = "2factor"  # "2factor" or "local" (offline stand-in for load tests)
+    OTP_PROVIDER_MAX_CONCURRENCY: int = 20  # In-flight calls / pooled connections to the provider
+    OTP_PROVIDER_TIMEOUT_SECONDS: float = 5.0  # Latency budget per provider call, queueing included
+    LOCAL_OTP_CODE: str = "123456"  # OTP accepted by the local provider
+    LOCAL_OTP_LATENCY_MS: float = 0  # Simulated provider latency for the local provider
+    LOCAL_OTP_FAILURE_RATE: float = 0  # Share of local provider calls that fail (0-1)
+    CATALOG_CACHE_TTL_SECONDS: float = 5.0  # How often each worker re-checks the catalog version
+    SETTINGS_CACHE_TTL_SECONDS: float = 2.0  # Poll interval for global_config without a change stream
+    IMPORT_WORKERS: int = 1  # Processes parsing spreadsheet uploads
+    RATE_LIMIT_ENABLED: bool = True  # Turn off only for load tests
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" (per worker) or "mongo" (shared by all workers)
+    RATE_LIMIT_TRUSTED_PROXY_HOPS: int = 0  # Proxies in front of the app that append to X-Forwarded-For (1 on Render)
+    COMPRESSION_MIN_SIZE: int = 1024  # Smaller responses are sent uncompressed
+    CATALOG_CACHE_CONTROL: str = "public, no-cache"  # Caches revalidate every read (cheap 304s), so admin edits show at once
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,165 @@
+"""
+Streaming CSV / XLSX export of Mongo collections.
+
+Rows are flattened one document at a time while iterating the Motor
+cursor, so memory stays constant whatever the collection size:
+  - CSV:  encoded in chunks of EXPORT_CHUNK_ROWS rows and yielded as soon
+          as each chunk is ready.
+  - XLSX: written with openpyxl's write-only mode (rows spill to a temp
+          file), then the finished workbook is streamed from disk.
+"""
+import csv
+import io
+import tempfile
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, List
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.normalize import NUMERIC_FIELDS
+from app.models.college import CollegeBase
+from app.models.student import BoardMarks, ExamScores, OlympiadScores
+
+EXPORT_CHUNK_ROWS = 500
+FILE_CHUNK_BYTES = 64 * 1024
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ", ".join(str(v) for v in value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _flatten_college(doc: dict) -> dict:
+    row = {k: v for k, v in doc.items() if k not in COLLEGE_INTERNAL_FIELDS}
+    coords = doc.get("coordinates")
+    if isinstance(coords, dict):
+        row["lat"] = coords.get("lat")
+        row["lng"] = coords.get("lng")
+    return row
+
+
+# Stored on college documents but never exported (numeric fields are re-derived on import)
+COLLEGE_INTERNAL_FIELDS = ("_id", "mongo_id", "coordinates", "importHash") + tuple(NUMERIC_FIELDS)
+
+
+def _college_columns(extra_keys: List[str]) -> List[str]:
+    columns = []
+    for field in CollegeBase.model_fields:
+        columns.extend(["lat", "lng"] if field == "coordinates" else [field])
+    # Keep fields that are stored but not (yet) part of the model
+    columns.extend(sorted(k for k in extra_keys if k not in columns and k not in COLLEGE_INTERNAL_FIELDS))
+    return columns
+
+
+def _flatten_nested(doc: dict) -> dict:
+    row = {}
+    for key, value in doc.items():
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                row[f"{key}.{sub_key}"] = sub_value
+        else:
+            row[key] = value
+    return row
+
+
+STUDENT_COLUMNS = (
+    ["phone", "studentName", "parentName", "homeState", "board", "phoneVerified", "createdAt", "updatedAt"]
+    + [f"marks.{f}" for f in BoardMarks.model_fields]
+    + [f"examScores.{f}" for f in ExamScores.model_fields]
+    + [f"olympiad.{f}" for f in OlympiadScores.model_fields]
+)
+
+
+def _flatten_application(doc: dict) -> dict:
+    row = _flatten_nested({k: v for k, v in doc.items() if k != "colleges"})
+    colleges = doc.get("colleges") or []
+    row["collegeIds"] = [c.get("collegeId") for c in colleges]
+    row["collegeNames"] = [c.get("name") for c in colleges]
+    return row
+
+
+APPLICATION_COLUMNS = [
+    "orderId", "studentPhone", "paymentStatus", "paymentId",
+    "pricing.subtotal", "pricing.discountPercent", "pricing.discountAmount", "pricing.finalAmount",
+    "collegeIds", "collegeNames", "createdAt", "updatedAt",
+]
+
+
+class ExportSpec:
+    def __init__(self, collection: str, flatten: Callable[[dict], dict], columns: List[str] = None, sort=None):
+        self.collection = collection
+        self.flatten = flatten
+        self.columns = columns
+        self.sort = sort
+
+
+EXPORTS: Dict[str, ExportSpec] = {
+    "colleges": ExportSpec("colleges", _flatten_college),
+    "students": ExportSpec("students", _flatten_nested, STUDENT_COLUMNS, sort=[("_id", 1)]),
+    "applications": ExportSpec("applications", _flatten_application, APPLICATION_COLUMNS, sort=[("createdAt", 1)]),
+}
+
+
+async def _stored_keys(collection) -> List[str]:
+    """Top-level field names across the collection, computed server-side."""
+    pipeline = [
+        {"$project": {"kv": {"$objectToArray": "$$ROOT"}}},
+        {"$unwind": "$kv"},
+        {"$group": {"_id": "$kv.k"}},
+    ]
+    return [doc["_id"] async for doc in collection.aggregate(pipeline)]
+
+
+async def export_columns(db, spec: ExportSpec) -> List[str]:
+    if spec.columns is not None:
+        return spec.columns
+    return _college_columns(await _stored_keys(db[spec.collection]))
+
+
+async def _rows(db, spec: ExportSpec, columns: List[str]) -> AsyncIterator[list]:
+    cursor = db[spec.collection].find()
+    if spec.sort:
+        cursor = cursor.sort(spec.sort)
+    async for doc in cursor:
+        row = spec.flatten(doc)
+        yield [_cell(row.get(column)) for column in columns]
+
+
+async def stream_csv(db, spec: ExportSpec, columns: List[str]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    pending = 0
+    async for row in _rows(db, spec, columns):
+        writer.writerow(row)
+        pending += 1
+        if pending >= EXPORT_CHUNK_ROWS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue()
+
+
+async def stream_xlsx(db, spec: ExportSpec, columns: List[str]) -> AsyncIterator[bytes]:
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(spec.collection)
+    sheet.append(columns)
+    async for row in _rows(db, spec, columns):
+        sheet.append(row)
+
+    with tempfile.TemporaryFile() as output:
+        await run_in_threadpool(workbook.save, output)
+        output.seek(0)
+        while True:
+            chunk = await run_in_threadpool(output.read, FILE_CHUNK_BYTES)
+            if not chunk:
+                break
+            yield chunk
@@ -0,0 +1,53 @@
+"""
+HTTP caching helpers — strong ETags and conditional GET handling.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts: str) -> str:
+    """Build a strong ETag from the given content fingerprints."""
+    digest = hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evaluate an If-None-Match header against our ETag.
+
+    If-None-Match uses the weak comparison function, so a `W/` prefix
+    sent back by an intermediary still counts as a match.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def cache_headers(etag: str, cache_control: str) -> dict:
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def not_modified(request: Request, response: Response, etag: str, cache_control: str) -> Optional[Response]:
+    """
+    Attach caching headers to `response`.
+
+    Returns a ready 304 response when the client already holds this
+    representation, otherwise None so the caller renders the body.
+    """
+    headers = cache_headers(etag, cache_control)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        if "vary" in response.headers:
+            headers["Vary"] = response.headers["vary"]
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
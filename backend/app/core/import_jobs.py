@@ -0,0 +1,185 @@
+"""
+Background college import jobs.
+
+Flow:
+  1. POST /colleges/import stores a job document in `import_jobs` and
+     returns its id straight away.
+  2. The upload is parsed and validated on a process pool (pandas and
+     openpyxl are CPU-bound) and diffed against the stored catalog.
+     Dry runs stop here with status "previewed".
+  3. Added and changed rows are written in bulk batches. After every
+     batch the job document is updated with rows processed, inserted,
+     updated and errors, so GET /colleges/import/{job_id} can report
+     progress from any worker.
+
+Jobs whose worker died stop sending heartbeats; they are reported as
+"interrupted" with the progress they had reached.
+"""
+import asyncio
+import multiprocessing
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.core.catalog import get_catalog
+from app.core.college_import import diff_import, prepare_import, write_import
+from app.core.config import settings
+from app.core.database import get_database
+
+ACTIVE_STATUSES = ("queued", "parsing", "diffing", "writing")
+HEARTBEAT_SECONDS = 15
+STALE_AFTER_SECONDS = 120
+MAX_STORED_ERRORS = 1000
+MAX_STORED_DIFF_IDS = 1000
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: never fork a process that owns event loop and driver threads
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.IMPORT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_import_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def create_job(filename: str, created_by: str, dry_run: bool = False) -> str:
+    db = get_database()
+    now = datetime.now(timezone.utc)
+    job_id = uuid.uuid4().hex
+    await db.import_jobs.insert_one({
+        "_id": job_id,
+        "filename": filename,
+        "createdBy": created_by,
+        "dryRun": dry_run,
+        "status": "queued",
+        "rowsTotal": None,
+        "rowsProcessed": 0,
+        "inserted": 0,
+        "updated": 0,
+        "unchanged": 0,
+        "errorCount": 0,
+        "errors": [],
+        "createdAt": now,
+        "updatedAt": now,
+        "heartbeatAt": now,
+    })
+    return job_id
+
+
+async def _update_job(job_id: str, fields: dict) -> None:
+    db = get_database()
+    now = datetime.now(timezone.utc)
+    await db.import_jobs.update_one(
+        {"_id": job_id},
+        {"$set": dict(fields, updatedAt=now, heartbeatAt=now)},
+    )
+
+
+async def _heartbeat(job_id: str) -> None:
+    while True:
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        await _update_job(job_id, {})
+
+
+def _progress_fields(results: dict) -> dict:
+    return {
+        "rowsProcessed": results["rowsProcessed"],
+        "inserted": results["inserted"],
+        "updated": results["updated"],
+        "unchanged": results["unchanged"],
+        "errorCount": len(results["errors"]),
+        "errors": results["errors"][:MAX_STORED_ERRORS],
+    }
+
+
+def _diff_fields(diff: dict) -> dict:
+    return {
+        "diffCounts": {kind: len(ids) for kind, ids in diff.items()},
+        "diff": {kind: ids[:MAX_STORED_DIFF_IDS] for kind, ids in diff.items()},
+    }
+
+
+async def run_job(job_id: str, filename: str, contents: bytes, dry_run: bool = False) -> None:
+    """Parse, diff and (unless dry_run) write one upload, recording progress."""
+    heartbeat = asyncio.create_task(_heartbeat(job_id))
+    # Set once any batch may have reached Mongo, even if the job then fails
+    wrote = False
+    try:
+        await _update_job(job_id, {"status": "parsing"})
+        loop = asyncio.get_running_loop()
+        prepared = await loop.run_in_executor(_get_pool(), prepare_import, filename, contents)
+
+        await _update_job(job_id, {
+            "status": "diffing",
+            "rowsTotal": len(prepared.rows),
+            "errorCount": len(prepared.errors),
+            "errors": prepared.errors[:MAX_STORED_ERRORS],
+        })
+        diff = await diff_import(get_database(), prepared)
+        if dry_run:
+            await _update_job(job_id, dict(
+                _diff_fields(diff), status="previewed", finishedAt=datetime.now(timezone.utc)
+            ))
+            return
+        await _update_job(job_id, dict(_diff_fields(diff), status="writing"))
+
+        async def on_progress(results: dict) -> None:
+            await _update_job(job_id, _progress_fields(results))
+
+        wrote = bool(diff["added"] or diff["changed"])
+        results = await write_import(get_database(), prepared, diff, on_progress=on_progress)
+
+        await _update_job(job_id, dict(
+            _progress_fields(results),
+            status="completed",
+            timing=results["timing"],
+            finishedAt=datetime.now(timezone.utc),
+        ))
+    except Exception as e:
+        if isinstance(e, BrokenProcessPool):
+            # A crashed parser process poisons the pool; start a fresh one next time
+            shutdown_import_pool()
+        print(f"Import job {job_id} failed: {e!r}")
+        await _update_job(job_id, {"status": "failed", "failure": str(e) or type(e).__name__})
+    finally:
+        heartbeat.cancel()
+        if wrote:
+            # Written rows stay written; every worker must reload the catalog
+            try:
+                await get_catalog().invalidate()
+            except Exception as e:
+                print(f"Import job {job_id}: catalog invalidation failed: {e!r}")
+
+
+async def get_job(job_id: str) -> Optional[dict]:
+    db = get_database()
+    job = await db.import_jobs.find_one({"_id": job_id})
+    if job is None:
+        return None
+
+    heartbeat = job.get("heartbeatAt")
+    if job["status"] in ACTIVE_STATUSES and heartbeat is not None:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=STALE_AFTER_SECONDS)
+        if heartbeat.replace(tzinfo=timezone.utc) < cutoff:
+            # The worker running this job is gone; rows already written stay written
+            await db.import_jobs.update_one(
+                {"_id": job_id, "status": job["status"]},
+                {"$set": {"status": "interrupted"}},
+            )
+            job["status"] = "interrupted"
+
+    job["jobId"] = job.pop("_id")
+    return job
@@ -0,0 +1,108 @@
+"""
+Declared MongoDB indexes and the query shapes they are meant to serve.
+
+`ensure_indexes` runs on startup (see app.main lifespan); creating an index
+that already exists is a no-op. `QUERY_SHAPES` lists the app's hot queries
+so scripts/check_query_plans.py can verify none of them scans a collection.
+"""
+from datetime import datetime, timezone
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+INDEXES = {
+    "colleges": [
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+        # Derived numeric fields (app.core.normalize): "fees under x, best median
+        # package first" walks the sort key and bounds fees from the index keys
+        IndexModel([("medianPackageLpa", DESCENDING), ("feesLakhs", ASCENDING)],
+                   name="medianPackageLpa_feesLakhs"),
+        IndexModel([("feesLakhs", ASCENDING)], name="feesLakhs"),
+        IndexModel([("avgPackageLpa", DESCENDING)], name="avgPackageLpa"),
+    ],
+    "students": [
+        IndexModel([("phone", ASCENDING)], unique=True, name="phone_unique"),
+    ],
+    "otp_sessions": [
+        # Latest verified / unverified session per phone
+        IndexModel([("phone", ASCENDING), ("verified", ASCENDING), ("created_at", DESCENDING)],
+                   name="phone_verified_created_at"),
+        # Each session stores its own deadline (see app.api.otp retention)
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+    ],
+    "applications": [
+        # Keyset pages on (createdAt, _id): per student, per payment status, all (and the export sort)
+        IndexModel([("studentPhone", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)],
+                   name="studentPhone_createdAt_id"),
+        IndexModel([("paymentStatus", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)],
+                   name="paymentStatus_createdAt_id"),
+        IndexModel([("createdAt", DESCENDING), ("_id", DESCENDING)], name="createdAt_id"),
+        IndexModel([("orderId", ASCENDING)], unique=True, name="orderId_unique"),
+    ],
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+    ],
+    "recommendations": [
+        IndexModel([("studentPhone", ASCENDING)], unique=True, name="studentPhone_unique"),
+    ],
+    "rate_limits": [
+        # Shared token buckets (RATE_LIMIT_BACKEND=mongo) drop once refilled
+        IndexModel([("expiresAt", ASCENDING)], expireAfterSeconds=0, name="expiresAt_ttl"),
+    ],
+}
+
+_sample_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+# (description, collection, filter, sort) for every hot query in app/api
+QUERY_SHAPES = [
+    ("show/update/delete college", "colleges", {"id": "sample"}, None),
+    ("colleges by fees and median package", "colleges",
+     {"feesLakhs": {"$lte": 10}}, {"medianPackageLpa": -1}),
+    ("colleges by fees", "colleges", {"feesLakhs": {"$lte": 10}}, {"feesLakhs": 1}),
+    ("student profile", "students", {"phone": "9000000000"}, None),
+    ("OTP verify", "otp_sessions", {"phone": "9000000000", "verified": False}, {"created_at": -1}),
+    ("onboarding OTP check", "otp_sessions", {"phone": "9000000000", "verified": True}, {"created_at": -1}),
+    ("my applications", "applications", {"studentPhone": "9000000000"}, {"createdAt": -1, "_id": -1}),
+    ("admin applications", "applications", {}, {"createdAt": -1, "_id": -1}),
+    ("admin applications by status", "applications",
+     {"paymentStatus": "paid", "createdAt": {"$gte": _sample_time}}, {"createdAt": -1, "_id": -1}),
+    ("applications export", "applications", {}, {"createdAt": 1}),
+    ("application by order", "applications", {"orderId": "NAV-2026-000000", "studentPhone": "9000000000"}, None),
+    ("admin login", "users", {"email": "admin@example.com"}, None),
+    ("stored recommendations", "recommendations", {"studentPhone": "9000000000"}, None),
+]
+
+
+async def ensure_indexes(db) -> None:
+    for collection, indexes in INDEXES.items():
+        try:
+            await db[collection].create_indexes(indexes)
+        except OperationFailure as e:
+            # e.g. duplicate values blocking a unique index — keep serving
+            print(f"Could not create indexes on {collection}: {e}")
+
+
+def _stages(plan) -> list:
+    """All stage names in an explain() plan tree."""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(_stages(item))
+    return stages
+
+
+async def explain_query_shapes(db) -> list:
+    """Return (description, collection, winning plan stages) for each query shape."""
+    results = []
+    for description, collection, query, sort in QUERY_SHAPES:
+        find = {"find": collection, "filter": query}
+        if sort:
+            find["sort"] = sort
+        explained = await db.command({"explain": find, "verbosity": "queryPlanner"})
+        results.append((description, collection, _stages(explained["queryPlanner"]["winningPlan"])))
+    return results
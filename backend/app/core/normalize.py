@@ -0,0 +1,176 @@
+"""
+Numeric values behind the free-text college metrics.
+
+Colleges store fees, packages, campus area, student-faculty ratio and
+cutoff as display strings ("₹21.5 Lakhs (4 years)", "₹12.00 LPA",
+"286 acres", "15:1", "JEE Main: 90%ile+"). The parsers here turn them into
+comparable numbers; anything that can't be read as a number gives None.
+
+Units:
+  - money:  lakhs of rupees (packages therefore come out in LPA)
+  - area:   acres
+  - ratio:  students per faculty member
+  - cutoff: percentile (or percentage), or a closing rank, kept apart
+
+The results are stored on each college next to the text (NUMERIC_FIELDS)
+on create, update and import, so they can be range-filtered, sorted and
+indexed. scripts/backfill_numeric_fields.py fills them in for existing
+documents.
+"""
+import re
+from typing import Dict, List, Optional
+
+NUMBER = r"(\d+(?:,\d+)*(?:\.\d+)?|\.\d+)"
+MONEY_REGEX = re.compile(NUMBER + r"\s*(crores?|cr|lakhs?|lacs?|lpa|l|k|thousand)?\b", re.IGNORECASE)
+AREA_REGEX = re.compile(NUMBER + r"\s*(acres?|ac|hectares?|ha|sq\.?\s*ft|sqft|square feet|sq\.?\s*m|square met(?:er|re)s?)?", re.IGNORECASE)
+RATIO_REGEX = re.compile(NUMBER + r"\s*:\s*" + NUMBER)
+PERCENTILE_REGEX = re.compile(NUMBER + r"\s*(?:%\s*ile|%|percentile|percent)", re.IGNORECASE)
+RANK_REGEX = re.compile(r"rank\D{0,12}?" + NUMBER, re.IGNORECASE)
+
+MONEY_UNITS_IN_LAKHS = {
+    "crore": 100, "crores": 100, "cr": 100,
+    "lakh": 1, "lakhs": 1, "lac": 1, "lacs": 1, "lpa": 1, "l": 1,
+    "k": 0.01, "thousand": 0.01,
+}
+AREA_UNITS_IN_ACRES = {"hectare": 2.47105, "hectares": 2.47105, "ha": 2.47105}
+SQFT_PER_ACRE = 43560
+SQM_PER_ACRE = 4046.86
+
+
+def _number(text: str) -> float:
+    return float(text.replace(",", ""))
+
+
+def parse_lakhs(text: Optional[str]) -> Optional[float]:
+    """
+    Amount in lakhs: "₹21.5 Lakhs (4 years)" -> 21.5, "₹1.2 Cr" -> 120.0,
+    "₹12.00 LPA" -> 12.0. A bare rupee amount ("₹2,50,000") is converted.
+    """
+    if not text:
+        return None
+    match = MONEY_REGEX.search(str(text))
+    if not match:
+        return None
+    value = _number(match.group(1))
+    unit = (match.group(2) or "").lower()
+    if unit:
+        return round(value * MONEY_UNITS_IN_LAKHS[unit], 4)
+    # No unit: large numbers are rupees, small ones already lakhs
+    return round(value / 100000, 4) if value >= 1000 else value
+
+
+def parse_acres(text: Optional[str]) -> Optional[float]:
+    """Campus area in acres: "286 acres" -> 286.0, "10 hectares" -> 24.71."""
+    if not text:
+        return None
+    match = AREA_REGEX.search(str(text))
+    if not match:
+        return None
+    value = _number(match.group(1))
+    unit = re.sub(r"[\s.]", "", (match.group(2) or "").lower())
+    if unit in AREA_UNITS_IN_ACRES:
+        value *= AREA_UNITS_IN_ACRES[unit]
+    elif unit in ("sqft", "squarefeet"):
+        value /= SQFT_PER_ACRE
+    elif unit.startswith(("sqm", "squaremet")):
+        value /= SQM_PER_ACRE
+    return round(value, 2)
+
+
+def parse_ratio(text: Optional[str]) -> Optional[float]:
+    """Students per faculty member: "15:1" -> 15.0."""
+    if not text:
+        return None
+    match = RATIO_REGEX.search(str(text))
+    if not match:
+        return None
+    students, faculty = _number(match.group(1)), _number(match.group(2))
+    return round(students / faculty, 2) if faculty else None
+
+
+def parse_cutoff_percentile(text: Optional[str]) -> Optional[float]:
+    """Percentile / percentage cutoff: "JEE Main: 90%ile+" -> 90.0."""
+    if not text:
+        return None
+    match = PERCENTILE_REGEX.search(str(text))
+    return _number(match.group(1)) if match else None
+
+
+def parse_cutoff_rank(text: Optional[str]) -> Optional[float]:
+    """Closing rank cutoff: "AEEE Rank < 5000" -> 5000.0."""
+    if not text:
+        return None
+    match = RANK_REGEX.search(str(text))
+    return _number(match.group(1)) if match else None
+
+
+# numeric field -> (text field it is derived from, parser)
+NUMERIC_FIELDS = {
+    "feesLakhs": ("fees", parse_lakhs),
+    "avgPackageLpa": ("avgPackage", parse_lakhs),
+    "highestPackageLpa": ("highestPackage", parse_lakhs),
+    "medianPackageLpa": ("medianPackage", parse_lakhs),
+    "campusAreaAcres": ("campusArea", parse_acres),
+    "studentsPerFaculty": ("studentFacultyRatio", parse_ratio),
+    "cutoffPercentile": ("cutoff", parse_cutoff_percentile),
+    "cutoffRank": ("cutoff", parse_cutoff_rank),
+}
+
+# Comparison columns -> True when a higher value is better
+COMPARE_COLUMNS = {
+    "feesLakhs": False,
+    "avgPackageLpa": True,
+    "highestPackageLpa": True,
+    "medianPackageLpa": True,
+    "placementPercent": True,
+    "rating": True,
+    "nirfRank": False,
+    "roi": True,
+    "campusAreaAcres": True,
+    "studentsPerFaculty": False,
+    "cutoffPercentile": True,
+    "cutoffRank": False,
+}
+
+
+def numeric_fields(college: dict) -> Dict[str, Optional[float]]:
+    """All NUMERIC_FIELDS values for one college document."""
+    return {name: parser(college.get(source)) for name, (source, parser) in NUMERIC_FIELDS.items()}
+
+
+def derived_fields(document: dict) -> Dict[str, Optional[float]]:
+    """
+    NUMERIC_FIELDS values for the text fields present in `document`.
+
+    Partial writes only carry the fields they change, so only the numbers
+    derived from those are recomputed.
+    """
+    return {
+        name: parser(document.get(source))
+        for name, (source, parser) in NUMERIC_FIELDS.items()
+        if source in document
+    }
+
+
+def compare_columns(colleges: List[dict]) -> Dict[str, dict]:
+    """
+    Column-wise numbers for a side-by-side comparison.
+
+    Each column lists one value per college (None when unknown) and the
+    id of the college with the best value, if any has one.
+    """
+    # Stored values first; parse the text for documents not yet backfilled
+    rows = [
+        dict(c, **{name: value for name, value in numeric_fields(c).items() if c.get(name) is None})
+        for c in colleges
+    ]
+    columns = {}
+    for name, higher_is_better in COMPARE_COLUMNS.items():
+        values = [row.get(name) for row in rows]
+        known = [(value, row["id"]) for value, row in zip(values, rows) if value is not None]
+        best = None
+        if known:
+            pick = max if higher_is_better else min
+            best = pick(known, key=lambda pair: pair[0])[1]
+        columns[name] = {"values": values, "best": best, "higherIsBetter": higher_is_better}
+    return columns
@@ -0,0 +1,151 @@
+"""
+OTP delivery providers.
+
+One provider instance lives for the whole app (created in the lifespan
+hook), so 2Factor calls reuse pooled keep-alive connections instead of a
+fresh TCP + TLS handshake per OTP.
+
+Providers (settings.OTP_PROVIDER):
+  - "2factor": 2Factor.in SMS API over a shared httpx.AsyncClient
+  - "local":   in-process stand-in for load tests and offline development;
+               every OTP is LOCAL_OTP_CODE, with optional simulated latency
+               and failure rate for exercising the circuit breaker
+"""
+import asyncio
+import random
+import uuid
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+
+TWOFACTOR_BASE_URL = "https://2factor.in/API/V1"
+
+try:
+    import h2  # noqa: F401 — enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class OTPProviderError(Exception):
+    """The provider could not be reached or rejected the request."""
+
+
+class OTPProvider(ABC):
+    name = "base"
+
+    @property
+    def configured(self) -> bool:
+        return True
+
+    @abstractmethod
+    async def send(self, phone: str) -> str:
+        """Send an OTP to `phone`; returns the provider session id."""
+
+    @abstractmethod
+    async def verify(self, session_id: str, otp: str) -> bool:
+        """Check `otp` against a session; True when it matches."""
+
+    async def close(self) -> None:
+        pass
+
+
+class TwoFactorProvider(OTPProvider):
+    name = "2factor"
+
+    def __init__(self, api_key: str, max_concurrency: int):
+        self.api_key = api_key
+        self._client = httpx.AsyncClient(
+            base_url=TWOFACTOR_BASE_URL,
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(connect=3.0, read=8.0, write=3.0, pool=2.0),
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+                keepalive_expiry=60.0,
+            ),
+        )
+        # Excess requests queue here rather than piling onto the provider
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    async def _get(self, path: str) -> dict:
+        async with self._slots:
+            try:
+                response = await self._client.get(f"/{self.api_key}{path}")
+                return response.json()
+            except (httpx.HTTPError, ValueError) as e:
+                raise OTPProviderError(f"Failed to reach OTP provider: {str(e)}")
+
+    async def send(self, phone: str) -> str:
+        # Voice on trial, SMS with DLT in production
+        data = await self._get(f"/SMS/{phone}/AUTOGEN")
+        if data.get("Status") != "Success":
+            raise OTPProviderError(data.get("Details", "Failed to send OTP"))
+        return data["Details"]
+
+    async def verify(self, session_id: str, otp: str) -> bool:
+        data = await self._get(f"/SMS/VERIFY/{session_id}/{otp}")
+        return data.get("Status") == "Success" and data.get("Details") == "OTP Matched"
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class LocalOTPProvider(OTPProvider):
+    name = "local"
+
+    def __init__(self, code: str, latency_ms: float = 0, failure_rate: float = 0):
+        self.code = code
+        self.latency = latency_ms / 1000
+        self.failure_rate = failure_rate
+
+    async def _simulate(self) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise OTPProviderError("Simulated OTP provider failure")
+
+    async def send(self, phone: str) -> str:
+        await self._simulate()
+        return f"local-{uuid.uuid4().hex}"
+
+    async def verify(self, session_id: str, otp: str) -> bool:
+        await self._simulate()
+        return otp == self.code
+
+
+_provider: Optional[OTPProvider] = None
+
+
+def create_otp_provider() -> OTPProvider:
+    if settings.OTP_PROVIDER == "local":
+        return LocalOTPProvider(
+            settings.LOCAL_OTP_CODE, settings.LOCAL_OTP_LATENCY_MS, settings.LOCAL_OTP_FAILURE_RATE
+        )
+    if settings.OTP_PROVIDER == "2factor":
+        return TwoFactorProvider(settings.TWOFACTOR_API_KEY, settings.OTP_PROVIDER_MAX_CONCURRENCY)
+    raise ValueError(f"Unknown OTP_PROVIDER: {settings.OTP_PROVIDER}")
+
+
+def start_otp_provider() -> None:
+    global _provider
+    _provider = create_otp_provider()
+    print(f"OTP provider: {_provider.name}")
+
+
+async def stop_otp_provider() -> None:
+    global _provider
+    if _provider is not None:
+        await _provider.close()
+        _provider = None
+
+
+def get_otp_provider() -> OTPProvider:
+    return _provider
@@ -0,0 +1,65 @@
+"""
+Keyset pagination over (createdAt, _id), newest first.
+
+A page is fetched with one indexed range query instead of skip/offset, so
+page 500 costs the same as page 1. The position is handed to clients as an
+opaque cursor: base64 of the last document's createdAt and _id.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+PAGE_SORT = [("createdAt", -1), ("_id", -1)]
+
+
+def encode_cursor(doc: dict) -> str:
+    raw = json.dumps([doc["createdAt"].isoformat(), str(doc["_id"])])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Raises ValueError for anything encode_cursor didn't produce."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, doc_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), ObjectId(doc_id)
+    except (ValueError, TypeError, InvalidId) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def field_projection(fields: Optional[str], allowed: Iterable[str]) -> Optional[dict]:
+    """
+    Projection for a comma-separated `fields` parameter (None = all fields).
+    createdAt is always included since the next cursor is built from it.
+    """
+    if not fields:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return {name: 1 for name in requested | {"createdAt"}}
+
+
+async def fetch_page(
+    collection, query: dict, limit: int, cursor: Optional[str] = None, projection: Optional[dict] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """One page of `query` newest first, plus the cursor for the next page (None on the last)."""
+    if cursor:
+        created_at, doc_id = decode_cursor(cursor)
+        after = {"$or": [
+            {"createdAt": {"$lt": created_at}},
+            {"createdAt": created_at, "_id": {"$lt": doc_id}},
+        ]}
+        query = {"$and": [query, after]} if query else after
+
+    # One extra document tells us whether another page exists
+    docs = await collection.find(query, projection).sort(PAGE_SORT).limit(limit + 1).to_list(limit + 1)
+    if len(docs) > limit:
+        docs = docs[:limit]
+        return docs, encode_cursor(docs[-1])
+    return docs, None
@@ -0,0 +1,157 @@
+"""
+Token-bucket rate limiting for the OTP and login endpoints.
+
+Each limit is a bucket of `capacity` tokens that refills at
+capacity / per_seconds tokens a second; a request takes one token or is
+rejected with 429 and a Retry-After header. Buckets are keyed by limit
+name plus a client IP, phone number or email, so abusive traffic is turned
+away before it reaches Mongo, bcrypt or the SMS provider.
+
+Backends (settings.RATE_LIMIT_BACKEND):
+  - "memory": per-process buckets; limits apply per worker.
+  - "mongo":  buckets in the `rate_limits` collection, shared by every
+              worker; each check is one atomic find_one_and_update.
+"""
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+from app.core.database import get_database
+
+MAX_MEMORY_BUCKETS = 100_000
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    name: str
+    capacity: int        # Burst size: requests allowed back to back
+    per_seconds: float   # Time for an empty bucket to refill completely
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.per_seconds
+
+
+class MemoryBucketStore:
+    def __init__(self):
+        # key -> (tokens, updated_at)
+        self._buckets = {}
+
+    async def take(self, limit: RateLimit, key: str, cost: int = 1) -> Tuple[bool, float]:
+        """Take `cost` tokens; returns (allowed, seconds until a token is available)."""
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (limit.capacity, now))
+        tokens = min(limit.capacity, tokens + (now - updated_at) * limit.refill_rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= cost
+        if len(self._buckets) >= MAX_MEMORY_BUCKETS and key not in self._buckets:
+            self._evict(now)
+        self._buckets[key] = (tokens, now)
+        return allowed, 0.0 if allowed else (1 - tokens) / limit.refill_rate
+
+    def _evict(self, now: float) -> None:
+        # Buckets idle for a long time are as good as full; forget the oldest half
+        oldest = sorted(self._buckets.items(), key=lambda item: item[1][1])
+        for key, _ in oldest[:len(oldest) // 2]:
+            del self._buckets[key]
+
+
+class MongoBucketStore:
+    async def take(self, limit: RateLimit, key: str, cost: int = 1) -> Tuple[bool, float]:
+        db = get_database()
+        now = datetime.now(timezone.utc)
+        elapsed = {"$divide": [{"$subtract": [now, {"$ifNull": ["$updatedAt", now]}]}, 1000]}
+        pipeline = [
+            {"$set": {"tokens": {"$min": [
+                limit.capacity,
+                {"$add": [{"$ifNull": ["$tokens", limit.capacity]}, {"$multiply": [elapsed, limit.refill_rate]}]},
+            ]}}},
+            {"$set": {"allowed": {"$gte": ["$tokens", 1]}}},
+            {"$set": {
+                "tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", cost]}, "$tokens"]},
+                "updatedAt": now,
+                # A bucket untouched this long is full again and can go (TTL index)
+                "expiresAt": now + timedelta(seconds=limit.per_seconds),
+            }},
+        ]
+        try:
+            bucket = await db.rate_limits.find_one_and_update(
+                {"_id": key}, pipeline, upsert=True, return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Lost an upsert race for a new bucket; it exists now
+            bucket = await db.rate_limits.find_one_and_update(
+                {"_id": key}, pipeline, return_document=ReturnDocument.AFTER
+            )
+        if bucket["allowed"]:
+            return True, 0.0
+        return False, (1 - bucket["tokens"]) / limit.refill_rate
+
+
+def _create_store():
+    if settings.RATE_LIMIT_BACKEND == "mongo":
+        return MongoBucketStore()
+    if settings.RATE_LIMIT_BACKEND == "memory":
+        return MemoryBucketStore()
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {settings.RATE_LIMIT_BACKEND}")
+
+
+store = _create_store()
+
+
+def wait_text(seconds: int) -> str:
+    """Human form of a Retry-After delay: "40 seconds", "5 minutes"."""
+    if seconds < 120:
+        return f"{seconds} second{'s' if seconds != 1 else ''}"
+    return f"{math.ceil(seconds / 60)} minutes"
+
+
+def client_ip(request: Request) -> str:
+    """
+    Address of the client as seen by the outermost trusted proxy.
+
+    Each of the RATE_LIMIT_TRUSTED_PROXY_HOPS proxies appends the address it
+    received the request from to X-Forwarded-For, so the client is the entry
+    that many hops from the right. Entries further left are set by the
+    client and can't be trusted.
+    """
+    hops = settings.RATE_LIMIT_TRUSTED_PROXY_HOPS
+    if hops > 0:
+        forwarded = [ip.strip() for ip in request.headers.get("x-forwarded-for", "").split(",") if ip.strip()]
+        if forwarded:
+            return forwarded[-min(hops, len(forwarded))]
+    return request.client.host if request.client else "unknown"
+
+
+async def check_rate_limit(limit: RateLimit, key: str, detail: Optional[str] = None, cost: int = 1) -> None:
+    """
+    Take `cost` tokens from `limit`'s bucket for `key`, or raise 429 if it
+    is empty. cost=0 only checks, for limits charged after the fact.
+
+    `{wait}` in `detail` is replaced with the time until a token is back.
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    allowed, retry_after = await store.take(limit, f"{limit.name}:{key}", cost)
+    if not allowed:
+        retry_after = math.ceil(retry_after)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=(detail or "Too many requests. Please try again in {wait}.").format(wait=wait_text(retry_after)),
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+def limit_by_ip(limit: RateLimit):
+    """Dependency applying `limit` per client IP."""
+    async def dependency(request: Request) -> None:
+        await check_rate_limit(limit, client_ip(request))
+    return dependency
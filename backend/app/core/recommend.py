@@ -0,0 +1,195 @@
+"""
+College recommendation engine — server-side port of src/utils/recommend.js.
+
+The catalog is turned into NumPy feature arrays once per snapshot, so a
+student is scored against every college in one vectorized pass:
+  1. Exam Match      — per-exam bitmasks over the student's exam groups
+  2. State Proximity — integer state codes
+  3. Affordability   — fees parsed to lakhs
+  4. Quality         — placement % and rating
+  5. NIRF bonus      — rank bucket points
+
+Scores are added up in the same order as recommend.js so both produce the
+exact same floating point values and therefore the same ranking.
+"""
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Mapping from form keys to the exam names used in college.entranceExams
+EXAM_KEY_TO_NAME = {
+    "jeePercentile": ["JEE Main", "JEE Mains", "JEE Advanced"],
+    "bitsatScore": ["BITSAT"],
+    "comedkRank": ["COMEDK"],
+    "viteeeRank": ["VITEEE"],
+    "kcetRank": ["KCET"],
+    "mhtcetPercentile": ["MHT-CET", "MHT CET"],
+    "eapcetRank": ["EAPCET", "AP EAPCET"],
+    "srmjeeRank": ["SRMJEE"],
+    "wbjeeRank": ["WBJEE"],
+}
+EXAM_KEYS = list(EXAM_KEY_TO_NAME)
+
+FEES_REGEX = re.compile(r"₹?([\d.]+)")
+JS_FLOAT_PREFIX = re.compile(r"\d+(?:\.\d*)?|\.\d+")
+
+NO_STATE = -1
+UNKNOWN_STATE = -2
+
+
+def parse_fees(fees: Optional[str]) -> Optional[float]:
+    """
+    Parse a fees string (e.g. "₹21.5 Lakhs (4 years)") into lakhs.
+
+    Returns None when there is no number, NaN when the number is malformed
+    (mirrors JavaScript's parseFloat on the matched text).
+    """
+    if not fees:
+        return None
+    match = FEES_REGEX.search(fees)
+    if not match:
+        return None
+    number = JS_FLOAT_PREFIX.match(match.group(1))
+    return float(number.group(0)) if number else float("nan")
+
+
+def student_exam_mask(exam_scores: Optional[dict]) -> int:
+    """Bitmask over EXAM_KEYS of the exams the student has filled in."""
+    mask = 0
+    for bit, key in enumerate(EXAM_KEYS):
+        value = (exam_scores or {}).get(key)
+        if value is not None and str(value).strip() != "":
+            mask |= 1 << bit
+    return mask
+
+
+def _exam_key_masks(exam: str) -> tuple:
+    """Which exam groups match a college exam exactly, and which partially."""
+    exact = partial = 0
+    for bit, key in enumerate(EXAM_KEYS):
+        names = [name.lower() for name in EXAM_KEY_TO_NAME[key]]
+        if exam in names:
+            exact |= 1 << bit
+        if any(exam in name or name in exam for name in names):
+            partial |= 1 << bit
+    return exact, partial
+
+
+def _truthy(values: List) -> np.ndarray:
+    """Float array where JavaScript-falsy values (null, 0, NaN) become 0."""
+    return np.array([v if v and v == v else 0.0 for v in values], dtype=np.float64)
+
+
+class RecommendationFeatures:
+    def __init__(self, colleges: List[dict]):
+        self.size = len(colleges)
+
+        # One row per (college, accepted exam)
+        owners, exact, partial = [], [], []
+        for pos, college in enumerate(colleges):
+            for exam in college.get("entranceExams") or []:
+                exam_exact, exam_partial = _exam_key_masks(exam.lower())
+                owners.append(pos)
+                exact.append(exam_exact)
+                partial.append(exam_partial)
+        self.exam_owner = np.array(owners, dtype=np.intp)
+        self.exam_exact = np.array(exact, dtype=np.int64)
+        self.exam_partial = np.array(partial, dtype=np.int64)
+
+        self.state_codes: Dict[str, int] = {}
+        states = []
+        for college in colleges:
+            state = (college.get("state") or "").lower()
+            if state:
+                states.append(self.state_codes.setdefault(state, len(self.state_codes)))
+            else:
+                states.append(NO_STATE)
+        self.state = np.array(states, dtype=np.int32)
+
+        fees = [parse_fees(college.get("fees")) for college in colleges]
+        self.fees_lakhs = np.array([np.nan if f is None else f for f in fees], dtype=np.float64)
+        has_fees = np.array([f is not None for f in fees])
+        # NaN fails every comparison and lands in the last bucket, as in JS
+        self.fees_points = np.where(
+            has_fees,
+            np.select(
+                [self.fees_lakhs <= 5, self.fees_lakhs <= 15, self.fees_lakhs <= 25],
+                [10.0, 7.0, 4.0],
+                default=1.0,
+            ),
+            0.0,
+        )
+
+        placement = _truthy([college.get("placementPercent") for college in colleges])
+        self.placement_points = np.where(placement != 0, np.minimum(placement / 100 * 15, 15), 0.0)
+
+        self.rating = _truthy([college.get("rating") for college in colleges])
+        self.rating_points = np.where(self.rating != 0, self.rating / 5 * 10, 0.0)
+
+        nirf = _truthy([college.get("nirfRank") for college in colleges])
+        self.nirf_points = np.select(
+            [nirf == 0, nirf <= 10, nirf <= 50, nirf <= 100],
+            [0.0, 10.0, 7.0, 4.0],
+            default=2.0,
+        )
+
+    def state_code(self, home_state: Optional[str]) -> int:
+        if not home_state:
+            return NO_STATE
+        return self.state_codes.get(home_state.lower(), UNKNOWN_STATE)
+
+    def _exam_counts(self, mask: int) -> np.ndarray:
+        hits = ((self.exam_exact & mask) != 0).astype(np.float64) + ((self.exam_partial & mask) != 0)
+        return np.bincount(self.exam_owner, weights=hits, minlength=self.size)
+
+    def score(self, exam_masks: np.ndarray, state_codes: np.ndarray) -> np.ndarray:
+        """
+        Score a batch of students against the whole catalog.
+
+        Returns a (students × colleges) matrix. Students with neither exams
+        nor a home state fall back to plain rating, like recommend.js.
+        """
+        exam_masks = np.asarray(exam_masks, dtype=np.int64)
+        state_codes = np.asarray(state_codes, dtype=np.int32)
+
+        # At most 2^9 distinct exam combinations — count each one once
+        unique_masks, inverse = np.unique(exam_masks, return_inverse=True)
+        exam_counts = np.stack([self._exam_counts(int(mask)) for mask in unique_masks])[inverse]
+
+        scores = np.minimum(exam_counts * 15, 40)
+        scores = scores + np.where(
+            (state_codes[:, None] >= 0) & (self.state[None, :] == state_codes[:, None]), 15.0, 0.0
+        )
+        scores = scores + self.fees_points
+        scores = scores + self.placement_points
+        scores = scores + self.rating_points
+        scores = scores + self.nirf_points
+
+        fallback = (exam_masks == 0) & (state_codes == NO_STATE)
+        scores[fallback] = self.rating
+        return scores
+
+    def score_student(self, exam_scores: Optional[dict], home_state: Optional[str]) -> np.ndarray:
+        masks = np.array([student_exam_mask(exam_scores)])
+        states = np.array([self.state_code(home_state)])
+        return self.score(masks, states)[0]
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Positions of the k highest scores, best first.
+
+    Uses a partial sort; ties keep catalog order, matching the stable
+    full sort in recommend.js.
+    """
+    n = scores.shape[0]
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < n:
+        kth = scores[np.argpartition(-scores, k - 1)[:k]].min()
+        candidates = np.flatnonzero(scores >= kth)
+    else:
+        candidates = np.arange(n)
+    order = np.argsort(-scores[candidates], kind="stable")
+    return candidates[order][:k]
@@ -0,0 +1,39 @@
+"""
+orjson-backed JSON responses.
+
+ORJSONResponse is the app's default response class (see app.main). It
+encodes datetimes natively and ObjectIds as strings, so handlers can return
+raw Mongo documents without converting them in Python first. Returning an
+ORJSONResponse instance directly also skips FastAPI's jsonable_encoder pass.
+
+For content that is served many times unchanged (the catalog), encode once
+with `dumps` and send the bytes with `json_bytes_response`.
+"""
+from typing import Any, Optional
+
+import orjson
+from bson import ObjectId
+from fastapi import Response
+from fastapi.responses import ORJSONResponse as _ORJSONResponse
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(_ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_bytes_response(body: bytes, status_code: int = 200, headers: Optional[dict] = None) -> Response:
+    """Send an already-encoded JSON body as is."""
+    return Response(content=body, status_code=status_code, headers=headers, media_type=JSON_MEDIA_TYPE)
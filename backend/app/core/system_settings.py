@@ -0,0 +1,89 @@
+"""
+Cached access to the admin-controlled `global_config` document.
+
+The OTP and onboarding endpoints read `is_otp_enabled` on every request.
+Instead of a Mongo round-trip each time, the document is kept in memory:
+  - The worker handling PUT /settings/otp updates its copy immediately.
+  - Other workers learn about the change from a change stream on
+    `system_settings` when the deployment supports it (replica sets/Atlas).
+  - Without a change stream, each worker re-reads the document at most
+    once every SETTINGS_CACHE_TTL_SECONDS.
+"""
+import asyncio
+import time
+from typing import Optional
+
+from app.core.config import settings
+from app.core.database import get_database
+
+GLOBAL_CONFIG_ID = "global_config"
+
+# Safety net re-read interval while a change stream keeps the cache fresh
+WATCHED_TTL_SECONDS = 300
+
+
+class SystemSettingsProvider:
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._config: Optional[dict] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._watcher: Optional[asyncio.Task] = None
+        self._watching = False
+
+    def _fresh(self) -> bool:
+        ttl = WATCHED_TTL_SECONDS if self._watching else self.ttl_seconds
+        return self._config is not None and time.monotonic() - self._loaded_at < ttl
+
+    async def get(self) -> dict:
+        """The global_config document, or {} if it was never saved."""
+        if self._fresh():
+            return self._config
+        async with self._lock:
+            if not self._fresh():
+                db = get_database()
+                self.set(await db.system_settings.find_one({"_id": GLOBAL_CONFIG_ID}))
+            return self._config
+
+    async def is_otp_enabled(self) -> bool:
+        config = await self.get()
+        return config.get("is_otp_enabled", True)
+
+    def set(self, config: Optional[dict]) -> None:
+        """Replace the cached document (after a local write or a pushed change)."""
+        self._config = config or {}
+        self._loaded_at = time.monotonic()
+
+    async def _watch(self) -> None:
+        db = get_database()
+        pipeline = [{"$match": {"documentKey._id": GLOBAL_CONFIG_ID}}]
+        try:
+            async with db.system_settings.watch(pipeline, full_document="updateLookup") as stream:
+                self._watching = True
+                async for change in stream:
+                    self.set(change.get("fullDocument"))
+        except Exception as e:
+            # Standalone servers have no change streams; the TTL poll covers it
+            print(f"Settings change stream unavailable, polling every {self.ttl_seconds}s: {e}")
+        finally:
+            self._watching = False
+
+    def start_watching(self) -> None:
+        if self._watcher is None:
+            self._watcher = asyncio.create_task(self._watch())
+
+    async def stop_watching(self) -> None:
+        if self._watcher is not None:
+            self._watcher.cancel()
+            try:
+                await self._watcher
+            except asyncio.CancelledError:
+                pass
+            self._watcher = None
+
+
+system_settings = SystemSettingsProvider(ttl_seconds=settings.SETTINGS_CACHE_TTL_SECONDS)
+
+
+def get_system_settings() -> SystemSettingsProvider:
+    return system_settings
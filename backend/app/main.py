@@ -1,22 +1,43 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from app.core.database import connect_to_mongo, close_mongo_connection
-from app.api import auth, colleges, otp, students, settings
+from app.core.database import connect_to_mongo, close_mongo_connection, get_database
+from app.core.indexes import ensure_indexes
+from app.core.catalog import get_catalog
+from app.core.import_jobs import shutdown_import_pool
+from app.core.otp_provider import start_otp_provider, stop_otp_provider
+from app.core.responses import ORJSONResponse
+from app.core.compression import CompressionMiddleware
+from app.core.system_settings import get_system_settings
+from app.api import applications, auth, colleges, exports, otp, students, settings
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup: Connect to DB
     await connect_to_mongo()
+    await ensure_indexes(get_database())
+    # Warm the college catalog so the first visitors don't pay for the load;
+    # if that fails the first request loads it instead
+    try:
+        await get_catalog().get()
+    except Exception as e:
+        print(f"Catalog warm-up failed: {e}")
+    get_system_settings().start_watching()
+    # One pooled HTTP client to the OTP provider for the app's lifetime
+    start_otp_provider()
     yield
     # Shutdown: Disconnect DB
+    await stop_otp_provider()
+    await get_system_settings().stop_watching()
+    shutdown_import_pool()
     await close_mongo_connection()
 
 app = FastAPI(
     title="Naviksha Master Engineering API",
     description="Backend for Dynamic College Data & Admin Panel",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS Configuration
@@ -36,11 +57,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip / Brotli for everything not already compressed by its route
+app.add_middleware(CompressionMiddleware)
+
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(colleges.router, prefix="/colleges", tags=["colleges"])
 app.include_router(otp.router, prefix="/otp", tags=["otp"])
 app.include_router(students.router, prefix="/students", tags=["students"])
 app.include_router(settings.router, prefix="/settings", tags=["settings"])
+app.include_router(exports.router, prefix="/exports", tags=["exports"])
+app.include_router(applications.router, prefix="/applications", tags=["applications"])
 
 @app.get("/")
 async def root():
@@ -48,4 +74,4 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {"status": "healthy", "circuits": {"otp_provider": otp.provider_breaker.metrics()}}
@@ -46,3 +46,7 @@ class ApplicationResponse(BaseModel):
         populate_by_name = True
         arbitrary_types_allowed = True
         json_encoders = {datetime: lambda v: v.isoformat() if v else None}
+
+
+# Fields a `fields=` parameter may ask for on application listings
+APPLICATION_FIELDS = [name for name in ApplicationResponse.model_fields if name != "id"]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from app.models.common import PyObjectId
 
 class Coordinates(BaseModel):
@@ -51,7 +51,54 @@ class CollegeUpdate(CollegeBase):
 
 class CollegeInDB(CollegeBase):
     mongo_id: Optional[PyObjectId] = Field(alias="_id", default=None)
+    # Derived from the text fields on every write (see app.core.normalize)
+    feesLakhs: Optional[float] = None
+    avgPackageLpa: Optional[float] = None
+    highestPackageLpa: Optional[float] = None
+    medianPackageLpa: Optional[float] = None
+    campusAreaAcres: Optional[float] = None
+    studentsPerFaculty: Optional[float] = None
+    cutoffPercentile: Optional[float] = None
+    cutoffRank: Optional[float] = None
 
     class Config:
         populate_by_name = True
         arbitrary_types_allowed = True
+
+class CollegeBatchRequest(BaseModel):
+    ids: List[str]
+
+# Named field sets for `?view=` on the college read endpoints (None = every field)
+VIEW_FIELDS: Dict[str, Optional[Tuple[str, ...]]] = {
+    # Discovery cards and horizontal lists
+    "card": (
+        "id", "name", "city", "state", "collegeType", "year", "logo", "logoDarkBg",
+        "rating", "nirfRank", "fees", "avgPackage", "placementPercent", "topRecruiters",
+    ),
+    # Side-by-side comparison table
+    "compare": (
+        "id", "name", "city", "state", "collegeType", "year", "logo", "fees",
+        "avgPackage", "highestPackage", "medianPackage", "placementPercent",
+        "nirfRank", "rating", "campusArea", "studentFacultyRatio", "cutoff",
+        "hostelAvailable", "totalSeats", "entranceExams", "accreditation",
+        "feesLakhs", "avgPackageLpa", "highestPackageLpa", "medianPackageLpa",
+        "campusAreaAcres", "studentsPerFaculty", "cutoffPercentile", "cutoffRank",
+    ),
+    "detail": None,
+}
+
+class CollegeSearchFilters(BaseModel):
+    """Discovery filters, mirroring the controls on the Discovery page."""
+    q: Optional[str] = None
+    collegeType: List[str] = []
+    category: List[str] = []
+    state: List[str] = []
+    courses: List[str] = []
+    entranceExams: List[str] = []
+    accreditation: List[str] = []
+    minPlacement: float = 0
+    maxFeesLakhs: Optional[float] = None
+    minAvgPackageLpa: Optional[float] = None
+    minMedianPackageLpa: Optional[float] = None
+    hostel: bool = False
+    nirfOnly: bool = False
@@ -0,0 +1,70 @@
+"""
+Backfill the numeric fields derived from college text (app.core.normalize).
+
+New writes derive them on create, update and import; this fills them in
+for documents stored before that, and recomputes them after a parser
+change.
+
+Flow:
+  1. Stream `colleges` with only the text fields the numbers come from.
+  2. Derive the numeric fields and skip documents already up to date.
+  3. Write the rest with unordered bulk_write batches of $set.
+  4. Bump the catalog version so every worker reloads its snapshot.
+
+Usage:
+  python scripts/backfill_numeric_fields.py [--batch-size 500] [--dry-run]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+from pymongo import UpdateOne
+
+# Add backend to python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.database import connect_to_mongo, get_database, close_mongo_connection
+from app.core.catalog import get_catalog
+from app.core.normalize import NUMERIC_FIELDS, numeric_fields
+
+SOURCE_FIELDS = sorted({source for source, _ in NUMERIC_FIELDS.values()})
+
+
+async def backfill(batch_size: int, dry_run: bool) -> None:
+    await connect_to_mongo()
+    db = get_database()
+    projection = {name: 1 for name in SOURCE_FIELDS + list(NUMERIC_FIELDS)}
+    scanned = updated = 0
+    operations = []
+    try:
+        async for doc in db.colleges.find({}, projection):
+            scanned += 1
+            derived = numeric_fields(doc)
+            if all(name in doc and doc[name] == value for name, value in derived.items()):
+                continue
+            operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": derived}))
+            if len(operations) >= batch_size:
+                updated += len(operations)
+                if not dry_run:
+                    await db.colleges.bulk_write(operations, ordered=False)
+                operations = []
+        if operations:
+            updated += len(operations)
+            if not dry_run:
+                await db.colleges.bulk_write(operations, ordered=False)
+
+        if updated and not dry_run:
+            await get_catalog().invalidate()
+        action = "would update" if dry_run else "updated"
+        print(f"Scanned {scanned} colleges, {action} {updated}")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Derive numeric fields for stored colleges")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="Count documents to update without writing")
+    args = parser.parse_args()
+    asyncio.run(backfill(args.batch_size, args.dry_run))
@@ -0,0 +1,172 @@
+"""
+Offline batch job: materialize college recommendations for every student.
+
+Flow:
+  1. Load the college catalog once and build the recommendation features.
+  2. Stream `students` in _id order with a cursor, `--batch-size` at a time.
+  3. Score each batch as a students × colleges matrix on a process pool.
+  4. Upsert the top-k per student into `recommendations` with bulk_write.
+  5. Record the last written _id in `job_checkpoints` so `--resume` can
+     pick up where an interrupted run stopped.
+
+Usage:
+  python scripts/batch_recommendations.py [--batch-size 1000] [--top-k 10]
+                                          [--workers N] [--resume]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+from pymongo import UpdateOne
+
+# Add backend to python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.database import connect_to_mongo, get_database, close_mongo_connection
+from app.core.catalog import get_catalog
+from app.core.recommend import RecommendationFeatures, student_exam_mask, top_k
+
+CHECKPOINT_ID = "batch_recommendations"
+
+# Per-process features, built once by the pool initializer
+_features: RecommendationFeatures = None
+
+
+def _init_worker(colleges):
+    global _features
+    _features = RecommendationFeatures(colleges)
+
+
+def _rank_batch(exam_masks, state_codes, k):
+    """Score one batch and return (positions, scores) of the top-k per student."""
+    scores = _features.score(exam_masks, state_codes)
+    ranked = []
+    for row in scores:
+        best = top_k(row, k)
+        ranked.append((best.tolist(), row[best].tolist()))
+    return ranked
+
+
+async def _load_checkpoint(db, resume: bool):
+    if not resume:
+        await db.job_checkpoints.delete_one({"_id": CHECKPOINT_ID})
+        return None
+    checkpoint = await db.job_checkpoints.find_one({"_id": CHECKPOINT_ID})
+    return checkpoint.get("lastId") if checkpoint else None
+
+
+async def _write_batch(db, batch, ranked, colleges, catalog_version):
+    now = datetime.now(timezone.utc)
+    operations = []
+    for student, (positions, scores) in zip(batch, ranked):
+        operations.append(UpdateOne(
+            {"studentPhone": student["phone"]},
+            {"$set": {
+                "collegeIds": [colleges[pos]["id"] for pos in positions],
+                "scores": scores,
+                "catalogVersion": catalog_version,
+                "generatedAt": now,
+            }},
+            upsert=True,
+        ))
+    if operations:
+        await db.recommendations.bulk_write(operations, ordered=False)
+    await db.job_checkpoints.update_one(
+        {"_id": CHECKPOINT_ID},
+        {"$set": {"lastId": batch[-1]["_id"], "catalogVersion": catalog_version, "updatedAt": now}},
+        upsert=True,
+    )
+
+
+async def batch_recommendations(batch_size: int, k: int, workers: int, resume: bool):
+    await connect_to_mongo()
+    db = get_database()
+
+    snapshot = await get_catalog().get()
+    colleges = snapshot.colleges
+    features = snapshot.recommendations
+    print(f"Catalog version {snapshot.version}: {len(colleges)} colleges")
+
+    last_id = await _load_checkpoint(db, resume)
+    query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+    if last_id is not None:
+        print(f"Resuming after _id {last_id}")
+
+    cursor = db.students.find(
+        query, {"phone": 1, "examScores": 1, "homeState": 1}
+    ).sort("_id", 1).batch_size(batch_size)
+
+    loop = asyncio.get_running_loop()
+    pool = None
+    if workers > 0:
+        # spawn: never fork a process whose Motor/pymongo threads are running
+        pool = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(colleges,),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    if pool is None:
+        _init_worker(colleges)
+
+    # Batches are scored concurrently but written in cursor order, so the
+    # checkpoint never skips over an unwritten batch.
+    in_flight = []
+    processed = 0
+    started = time.monotonic()
+
+    async def flush_oldest():
+        nonlocal processed
+        batch, pending = in_flight.pop(0)
+        ranked = await pending
+        await _write_batch(db, batch, ranked, colleges, snapshot.version)
+        processed += len(batch)
+        rate = processed / max(time.monotonic() - started, 1e-9)
+        print(f"Wrote {processed} students ({rate:.0f}/s)")
+
+    async def submit(batch):
+        exam_masks = np.array([student_exam_mask(s.get("examScores")) for s in batch], dtype=np.int64)
+        state_codes = np.array([features.state_code(s.get("homeState")) for s in batch], dtype=np.int32)
+        if pool is not None:
+            pending = loop.run_in_executor(pool, _rank_batch, exam_masks, state_codes, k)
+        else:
+            pending = asyncio.sleep(0, _rank_batch(exam_masks, state_codes, k))
+        in_flight.append((batch, pending))
+        if len(in_flight) > max(workers, 1):
+            await flush_oldest()
+
+    try:
+        batch = []
+        async for student in cursor:
+            if not student.get("phone"):
+                continue
+            batch.append(student)
+            if len(batch) >= batch_size:
+                await submit(batch)
+                batch = []
+        if batch:
+            await submit(batch)
+        while in_flight:
+            await flush_oldest()
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        await close_mongo_connection()
+
+    print(f"Done: {processed} students in {time.monotonic() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Materialize recommendations for all students")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Scoring processes; 0 scores inline")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue after the last checkpoint instead of starting over")
+    args = parser.parse_args()
+    asyncio.run(batch_recommendations(args.batch_size, args.top_k, args.workers, args.resume))
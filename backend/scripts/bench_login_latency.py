@@ -0,0 +1,92 @@
+"""
+Measure how an admin login burst affects other requests on a running server.
+
+Phase 1 probes GET /health alone for a baseline. Phase 2 probes it again
+while --logins POST /auth/token requests run, --concurrency at a time.
+Prints p50/p95/p99/max probe latency for both phases. With bcrypt on the
+event loop, phase 2 p99 climbs towards the hash time; off the loop it stays
+close to the baseline.
+
+Start the server with RATE_LIMIT_ENABLED=false, otherwise the login rate
+limits answer most of the burst with 429 before bcrypt runs.
+
+Usage:
+  python scripts/bench_login_latency.py --url http://localhost:8000 \\
+      --email admin@naviksha.com --password adminpassword
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def report(label: str, samples: list) -> None:
+    ms = [s * 1000 for s in samples]
+    print(
+        f"{label:<14} n={len(ms):<5} p50={percentile(ms, 50):7.1f}ms  p95={percentile(ms, 95):7.1f}ms  "
+        f"p99={percentile(ms, 99):7.1f}ms  max={max(ms):7.1f}ms"
+    )
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event, interval: float) -> list:
+    samples = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/health")
+        samples.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+    return samples
+
+
+async def login_burst(client: httpx.AsyncClient, args) -> dict:
+    slots = asyncio.Semaphore(args.concurrency)
+    statuses = {}
+
+    async def login():
+        async with slots:
+            response = await client.post(
+                "/auth/token", data={"username": args.email, "password": args.password}
+            )
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    await asyncio.gather(*(login() for _ in range(args.logins)))
+    return statuses
+
+
+async def bench(args) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency + 4)
+    async with httpx.AsyncClient(base_url=args.url, timeout=60.0, limits=limits) as client:
+        await client.get("/health")  # open a connection before timing
+
+        stop = asyncio.Event()
+        baseline = asyncio.create_task(probe(client, stop, args.interval))
+        await asyncio.sleep(args.baseline_seconds)
+        stop.set()
+        report("baseline", await baseline)
+
+        stop = asyncio.Event()
+        during = asyncio.create_task(probe(client, stop, args.interval))
+        started = time.perf_counter()
+        statuses = await login_burst(client, args)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        report("during logins", await during)
+        print(f"{args.logins} logins in {elapsed:.2f}s, status codes: {statuses}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="p99 of /health during an admin login burst")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@naviksha.com")
+    parser.add_argument("--password", default="adminpassword")
+    parser.add_argument("--logins", type=int, default=50, help="Login requests in the burst")
+    parser.add_argument("--concurrency", type=int, default=10, help="Logins in flight at once")
+    parser.add_argument("--interval", type=float, default=0.005, help="Pause between /health probes (s)")
+    parser.add_argument("--baseline-seconds", type=float, default=3.0)
+    asyncio.run(bench(parser.parse_args()))
@@ -0,0 +1,50 @@
+"""
+Verify that every hot query shape is served by an index.
+
+Runs explain() on each entry of app.core.indexes.QUERY_SHAPES and exits
+with status 1 if any winning plan contains a COLLSCAN.
+
+Usage:
+  python scripts/check_query_plans.py [--ensure]
+
+  --ensure   create the declared indexes first (same as app startup)
+"""
+import argparse
+import asyncio
+import sys
+import os
+
+# Add backend to python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.database import connect_to_mongo, get_database, close_mongo_connection
+from app.core.indexes import ensure_indexes, explain_query_shapes
+
+
+async def check_query_plans(ensure: bool) -> int:
+    await connect_to_mongo()
+    db = get_database()
+    try:
+        if ensure:
+            await ensure_indexes(db)
+
+        failures = 0
+        for description, collection, stages in await explain_query_shapes(db):
+            scanned = "COLLSCAN" in stages
+            failures += scanned
+            print(f"{'FAIL' if scanned else 'ok  '} {collection:<16} {description:<28} {' > '.join(stages)}")
+    finally:
+        await close_mongo_connection()
+
+    if failures:
+        print(f"{failures} query shape(s) fall back to a collection scan")
+        return 1
+    print("All query shapes use an index")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail if any app query shape needs a COLLSCAN")
+    parser.add_argument("--ensure", action="store_true", help="Create declared indexes before checking")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(check_query_plans(args.ensure)))
@@ -0,0 +1,59 @@
+"""
+One-off migration: bring OTP sessions written before `expires_at` existed
+under the TTL retention policy (see app.api.otp).
+
+Flow:
+  1. Delete unverified sessions already older than SESSION_RETENTION_SECONDS.
+  2. Give verified sessions an `expires_at` of created_at +
+     VERIFIED_RETENTION_SECONDS and drop session_id / verify_attempts.
+  3. Give the remaining unverified sessions created_at +
+     SESSION_RETENTION_SECONDS.
+
+Only documents missing `expires_at` are touched, so re-running it is
+harmless, but each run scans `otp_sessions`; run it once after deploying,
+not on startup.
+
+Usage:
+  python scripts/compact_otp_sessions.py
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+# Add backend to python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.database import connect_to_mongo, get_database, close_mongo_connection
+from app.api.otp import SESSION_RETENTION_SECONDS, VERIFIED_RETENTION_SECONDS
+
+
+async def compact_otp_sessions() -> None:
+    await connect_to_mongo()
+    db = get_database()
+    try:
+        now = datetime.now(timezone.utc)
+        deleted = await db.otp_sessions.delete_many({
+            "expires_at": {"$exists": False},
+            "verified": False,
+            "created_at": {"$lt": now - timedelta(seconds=SESSION_RETENTION_SECONDS)},
+        })
+        verified = await db.otp_sessions.update_many(
+            {"expires_at": {"$exists": False}, "verified": True},
+            [
+                {"$set": {"expires_at": {"$add": ["$created_at", VERIFIED_RETENTION_SECONDS * 1000]}}},
+                {"$unset": ["session_id", "verify_attempts"]},
+            ]
+        )
+        unverified = await db.otp_sessions.update_many(
+            {"expires_at": {"$exists": False}, "verified": False},
+            [{"$set": {"expires_at": {"$add": ["$created_at", SESSION_RETENTION_SECONDS * 1000]}}}]
+        )
+        print(f"Deleted {deleted.deleted_count} expired sessions, compacted {verified.modified_count} verified, "
+              f"set expiry on {unverified.modified_count} unverified")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(compact_otp_sessions())
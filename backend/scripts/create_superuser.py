@@ -7,7 +7,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from app.core.database import connect_to_mongo, get_database, close_mongo_connection
 from app.models.user import UserInDB
-from app.core.security import get_password_hash
+from app.core.security import hash_password
 
 async def create_superuser():
     await connect_to_mongo()
@@ -20,7 +20,7 @@ async def create_superuser():
     if existing_user:
         print(f"User {email} already exists.")
     else:
-        hashed_password = get_password_hash(password)
+        hashed_password = await hash_password(password)
         user_in = UserInDB(
             email=email,
             hashed_password=hashed_password
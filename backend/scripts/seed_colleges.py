@@ -8,6 +8,8 @@ import ast
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from app.core.database import connect_to_mongo, get_database, close_mongo_connection
+from app.core.catalog import get_catalog
+from app.core.normalize import derived_fields
 from app.models.college import CollegeCreate
 
 def parse_js_data(file_path):
@@ -97,6 +99,7 @@ async def seed_colleges():
         
         await connect_to_mongo()
         db = get_database()
+        inserted = 0
         
         for item in data:
             # Clean data if needed?
@@ -113,12 +116,18 @@ async def seed_colleges():
                 
                 # Validate with Pydantic
                 college_in = CollegeCreate(**item)
-                await db.colleges.insert_one(college_in.model_dump(by_alias=True, exclude={"mongo_id"}))
+                college_data = college_in.model_dump(by_alias=True, exclude={"mongo_id"})
+                college_data.update(derived_fields(college_data))
+                await db.colleges.insert_one(college_data)
+                inserted += 1
                 print(f"Inserted {item['name']}")
                 
             except Exception as e:
                 print(f"Error inserting {item.get('name')}: {e}")
 
+        # Bump the catalog version so running workers reload their snapshot
+        if inserted:
+            await get_catalog().invalidate()
         await close_mongo_connection()
         
     except Exception as e:
@@ -47,10 +47,16 @@ function UserFlow() {
                 // Have to import studentApi dynamically or at top level. It's safe at top level.
                 // We'll add the import at the top of the file in the next step.
                 const { default: studentApi } = await import('./utils/studentApi');
-                const res = await studentApi.get('/students/applications');
-                if (ignore) return;
+                // Applications come in pages; follow nextCursor until the last one
+                const apps = [];
+                let cursor = null;
+                do {
+                    const res = await studentApi.get('/students/applications', { params: cursor ? { cursor } : {} });
+                    if (ignore) return;
+                    apps.push(...(res.data.applications || []));
+                    cursor = res.data.nextCursor;
+                } while (cursor);
 
-                const apps = res.data.applications || [];
                 const ids = apps.flatMap(app => (app.colleges || []).map(c => c.collegeId));
                 const uniqueIds = [...new Set(ids)];
                 setAppliedCollegeIds(uniqueIds);
@@ -2,6 +2,7 @@ import React, { useState, useMemo, useEffect } from 'react';
 import { Sparkles, ShoppingCart, Info, Search, SlidersHorizontal, X, Building2, GraduationCap, Award, Home, ArrowLeft } from 'lucide-react';
 import HorizontalList from './HorizontalList';
 import useColleges from '../../hooks/useColleges';
+import useCollegeSearch from '../../hooks/useCollegeSearch';
 import { getRecommendedColleges } from '../../utils/recommend';
 import studentApi from '../../utils/studentApi';
 import { isStudentLoggedIn } from '../../utils/studentAuth';
@@ -11,13 +12,37 @@ const STORAGE_KEYS = {
     formData: 'naviksha_formData',
 };
 
+// Client-side stand-in for /colleges/search, used until the first search
+// returns or when the API can't be reached (static data)
+const filterLocally = (colleges, searchTerm, filters) => colleges.filter(c => {
+    // Search
+    const matchesSearch = !searchTerm ||
+        c.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
+        c.city.toLowerCase().includes(searchTerm.toLowerCase()) ||
+        (c.courses || []).some(course => course.toLowerCase().includes(searchTerm.toLowerCase()));
+
+    // College Type
+    const matchesType = filters.collegeType.length === 0 || filters.collegeType.includes(c.collegeType);
+
+    // Placement %
+    const matchesPlacement = filters.minPlacement === 0 || (c.placementPercent && c.placementPercent >= filters.minPlacement);
+
+    // Hostel
+    const matchesHostel = !filters.hasHostel || c.hostelAvailable === true;
+
+    // Courses
+    const matchesCourses = filters.courses.length === 0 ||
+        filters.courses.some(fc => (c.courses || []).includes(fc));
+
+    // NIRF
+    const matchesNirf = !filters.nirfOnly || c.nirfRank !== null;
+
+    return matchesSearch && matchesType && matchesPlacement && matchesHostel && matchesCourses && matchesNirf;
+});
+
 const DiscoveryPage = ({ selectedColleges, appliedCollegeIds = [], onToggleCollege, onOpenSummary, onOpenCheckout, onBackToForm }) => {
     const { colleges: COLLEGE_DATA, loading, error } = useColleges();
 
-    // Derived Constants
-    const ALL_COLLEGE_TYPES = useMemo(() => [...new Set(COLLEGE_DATA.map(c => c.collegeType).filter(Boolean))], [COLLEGE_DATA]);
-    const ALL_COURSES = useMemo(() => [...new Set(COLLEGE_DATA.flatMap(c => c.courses || []))].sort(), [COLLEGE_DATA]);
-
     const [searchTerm, setSearchTerm] = useState('');
     const [showFilters, setShowFilters] = useState(false);
 
@@ -40,6 +65,24 @@ const DiscoveryPage = ({ selectedColleges, appliedCollegeIds = [], onToggleColle
         return count;
     }, [filters]);
 
+    // Filtering happens server-side; the full list is shown when nothing is set
+    const hasActiveQuery = searchTerm.trim() !== '' || activeFilterCount > 0;
+    const { results, facets, error: searchError } = useCollegeSearch(searchTerm, filters, hasActiveQuery);
+
+    // Filter options with how many results each would give (from /colleges/facets)
+    const facetCounts = useMemo(() => {
+        if (!facets) return {};
+        return Object.fromEntries(Object.entries(facets).map(([field, values]) => [
+            field, Object.fromEntries(values.map(v => [v.value, v.count])),
+        ]));
+    }, [facets]);
+    const ALL_COLLEGE_TYPES = useMemo(() => (
+        facets ? facets.collegeType.map(v => v.value) : [...new Set(COLLEGE_DATA.map(c => c.collegeType).filter(Boolean))]
+    ), [facets, COLLEGE_DATA]);
+    const ALL_COURSES = useMemo(() => (
+        facets ? facets.courses.map(v => v.value).sort() : [...new Set(COLLEGE_DATA.flatMap(c => c.courses || []))].sort()
+    ), [facets, COLLEGE_DATA]);
+
     const toggleArrayFilter = (key, value) => {
         setFilters(prev => ({
             ...prev,
@@ -54,32 +97,11 @@ const DiscoveryPage = ({ selectedColleges, appliedCollegeIds = [], onToggleColle
     };
 
     const filteredData = useMemo(() => {
-        return COLLEGE_DATA.filter(c => {
-            // Search
-            const matchesSearch = !searchTerm ||
-                c.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                c.city.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                (c.courses || []).some(course => course.toLowerCase().includes(searchTerm.toLowerCase()));
-
-            // College Type
-            const matchesType = filters.collegeType.length === 0 || filters.collegeType.includes(c.collegeType);
-
-            // Placement %
-            const matchesPlacement = filters.minPlacement === 0 || (c.placementPercent && c.placementPercent >= filters.minPlacement);
-
-            // Hostel
-            const matchesHostel = !filters.hasHostel || c.hostelAvailable === true;
-
-            // Courses
-            const matchesCourses = filters.courses.length === 0 ||
-                filters.courses.some(fc => (c.courses || []).includes(fc));
-
-            // NIRF
-            const matchesNirf = !filters.nirfOnly || c.nirfRank !== null;
-
-            return matchesSearch && matchesType && matchesPlacement && matchesHostel && matchesCourses && matchesNirf;
-        });
-    }, [searchTerm, filters, COLLEGE_DATA]);
+        if (!hasActiveQuery) return COLLEGE_DATA;
+        if (results && !searchError) return results;
+        // First search still in flight, or the API is down (static data)
+        return filterLocally(COLLEGE_DATA, searchTerm, filters);
+    }, [hasActiveQuery, results, searchError, searchTerm, filters, COLLEGE_DATA]);
 
     // Read student form data from sessionStorage for recommendations
     const studentFormData = useMemo(() => {
@@ -203,6 +225,9 @@ const DiscoveryPage = ({ selectedColleges, appliedCollegeIds = [], onToggleColle
                                         )}
                                     >
                                         {type}
+                                        {facetCounts.collegeType?.[type] !== undefined && (
+                                            <span className="ml-1 opacity-70">{facetCounts.collegeType[type]}</span>
+                                        )}
                                     </button>
                                 ))}
                             </div>
@@ -269,6 +294,9 @@ const DiscoveryPage = ({ selectedColleges, appliedCollegeIds = [], onToggleColle
                                         )}
                                     >
                                         {course}
+                                        {facetCounts.courses?.[course] !== undefined && (
+                                            <span className="ml-1 opacity-70">{facetCounts.courses[course]}</span>
+                                        )}
                                     </button>
                                 ))}
                             </div>
@@ -0,0 +1,64 @@
+import { useState, useEffect } from 'react';
+import api from '../utils/api';
+
+const SEARCH_DEBOUNCE_MS = 250;
+const SEARCH_LIMIT = 200;
+
+// FastAPI expects repeated keys (courses=a&courses=b), not axios' courses[]=a
+const buildSearchParams = (searchTerm, filters) => {
+    const params = new URLSearchParams();
+    if (searchTerm.trim()) params.append('q', searchTerm.trim());
+    filters.collegeType.forEach(type => params.append('collegeType', type));
+    filters.courses.forEach(course => params.append('courses', course));
+    if (filters.minPlacement > 0) params.append('minPlacement', filters.minPlacement);
+    if (filters.hasHostel) params.append('hostel', 'true');
+    if (filters.nirfOnly) params.append('nirfOnly', 'true');
+    return params;
+};
+
+/**
+ * Server-side discovery filtering: matching colleges from /colleges/search
+ * and per-option result counts from /colleges/facets.
+ *
+ * `results` is null until the first search for an active query returns, and
+ * stays null when `active` is false (nothing to filter). On failure `error`
+ * is set so the caller can fall back to filtering its local copy.
+ */
+const useCollegeSearch = (searchTerm, filters, active) => {
+    const [results, setResults] = useState(null);
+    const [facets, setFacets] = useState(null);
+    const [error, setError] = useState(null);
+
+    useEffect(() => {
+        const controller = new AbortController();
+        const params = buildSearchParams(searchTerm, filters);
+
+        const timer = setTimeout(async () => {
+            try {
+                const [searchResponse, facetsResponse] = await Promise.all([
+                    active
+                        ? api.get(`/colleges/search?${params}&limit=${SEARCH_LIMIT}`, { signal: controller.signal })
+                        : null,
+                    api.get(`/colleges/facets?${params}`, { signal: controller.signal }),
+                ]);
+                setResults(searchResponse ? searchResponse.data.colleges : null);
+                setFacets(facetsResponse.data.facets);
+                setError(null);
+            } catch (err) {
+                if (err.name !== 'CanceledError') {
+                    console.warn("College search failed, filtering locally", err);
+                    setError(err);
+                }
+            }
+        }, SEARCH_DEBOUNCE_MS);
+
+        return () => {
+            clearTimeout(timer);
+            controller.abort();
+        };
+    }, [searchTerm, filters, active]);
+
+    return { results: active ? results : null, facets, error };
+};
+
+export default useCollegeSearch;
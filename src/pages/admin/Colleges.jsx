@@ -62,7 +62,20 @@ const Colleges = () => {
             const res = await api.post('/colleges/import', formData, {
                 headers: { 'Content-Type': 'multipart/form-data' }
             });
-            setMessage(`Upload success: ${res.data.inserted} inserted, ${res.data.updated} updated.`);
+
+            // The import runs as a background job — poll until it settles
+            let job = res.data;
+            while (['queued', 'parsing', 'diffing', 'writing'].includes(job.status)) {
+                setMessage(`Importing... ${job.rowsProcessed || 0}${job.rowsTotal ? ` / ${job.rowsTotal}` : ''} rows`);
+                await new Promise(resolve => setTimeout(resolve, 1500));
+                job = (await api.get(`/colleges/import/${res.data.jobId}`)).data;
+            }
+
+            if (job.status === 'completed') {
+                setMessage(`Upload success: ${job.inserted} inserted, ${job.updated} updated, ${job.unchanged} unchanged${job.errorCount ? `, ${job.errorCount} errors` : ''}.`);
+            } else {
+                setMessage(`Upload ${job.status}: ${job.inserted} inserted, ${job.updated} updated before it stopped.`);
+            }
             fetchColleges();
             setFile(null);
         } catch (err) {